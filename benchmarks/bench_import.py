@@ -0,0 +1,55 @@
+"""Measure time needed to `import rwrap` using `python -X importtime`.
+
+Usage: python benchmarks/bench_import.py [--repeats N] [--max-ms MS]
+
+Exits with a non-zero status if the median import time exceeds `--max-ms`,
+which allows to guard against regressions in CI.
+"""
+
+import sys
+import argparse
+import statistics
+import subprocess
+
+
+def measure_import(module="rwrap"):
+    """Return cumulative import times (in microseconds) of all imported modules."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [measure_import() for _ in range(args.repeats)]
+    total_ms = statistics.median(run["rwrap"] for run in runs) / 1000
+
+    print(f"import rwrap: {total_ms:.1f}ms (median of {args.repeats} runs)")
+    print("slowest imports (cumulative):")
+    for name, time in sorted(runs[-1].items(), key=lambda x: -x[1])[: args.top]:
+        print(f"  {name}: {time / 1000:.1f}ms")
+
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"Import time exceeds limit of {args.max_ms}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Compare bulk Py->R conversion of homogeneous sequences to per-element conversion.
+
+Usage: python benchmarks/bench_py2rpy.py [size]
+"""
+
+import sys
+import timeit
+
+import numpy as np
+import rpy2.robjects as ro
+
+from rwrap.converter import converter
+
+
+def per_element(obj, VectorClass):
+    """Conversion as performed before bulk conversion was implemented."""
+    return VectorClass([converter.py2rpy(x) for x in obj])
+
+
+def main(size=1_000_000):
+    data = {
+        "float": (np.random.random(size).tolist(), ro.FloatVector),
+        "int": (np.random.randint(0, 1000, size).tolist(), ro.IntVector),
+        "str": ([f"ENSG{i:011d}" for i in range(size)], ro.StrVector),
+    }
+
+    print(f"size={size}")
+    for name, (obj, VectorClass) in data.items():
+        t_old = min(timeit.repeat(lambda: per_element(obj, VectorClass), number=1))
+        t_new = min(timeit.repeat(lambda: converter.py2rpy(obj), number=1))
+        print(
+            f"list[{name}]: per-element {t_old:.3f}s, bulk {t_new:.3f}s ({t_old / t_new:.1f}x)"
+        )
+
+    arr = np.random.random(size)
+    t_old = min(timeit.repeat(lambda: per_element(arr, ro.FloatVector), number=1))
+    t_new = min(timeit.repeat(lambda: converter.py2rpy(arr), number=1))
+    print(
+        f"np.ndarray[float]: per-element {t_old:.3f}s, bulk {t_new:.3f}s ({t_old / t_new:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,88 @@
+"""Benchmark cases for Py<->R conversions.
+
+Each case provides an R function creating an R object with `n` elements (for rpy2py)
+and a Python function creating the corresponding Python object (for py2rpy).
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+
+def _dataframe(n):
+    return pd.DataFrame(
+        {
+            "x": np.random.random(n),
+            "y": np.random.randint(0, 100, n),
+            "z": np.random.random(n) > 0.5,
+            "s": [f"gene{i}" for i in range(n)],
+        }
+    )
+
+
+def _sf(n):
+    import geopandas as gpd
+
+    return gpd.GeoDataFrame(
+        {"x": np.random.random(n)},
+        geometry=gpd.points_from_xy(np.random.random(n), np.random.random(n)),
+        crs="EPSG:4326",
+    )
+
+
+def _graph(n):
+    import igraph
+
+    return igraph.Graph.Ring(n)
+
+
+def _nested_list(n):
+    return [{"a": i, "b": [float(i), 2.0]} for i in range(n // 3)]
+
+
+CASES = {
+    "vector_float": ("function(n) runif(n)", lambda n: np.random.random(n)),
+    "vector_int": (
+        "function(n) sample.int(100L, n, replace = TRUE)",
+        lambda n: np.random.randint(0, 100, n),
+    ),
+    "vector_logical": (
+        "function(n) runif(n) > 0.5",
+        lambda n: np.random.random(n) > 0.5,
+    ),
+    "vector_str": (
+        "function(n) paste0('gene', seq_len(n))",
+        lambda n: [f"gene{i}" for i in range(n)],
+    ),
+    "vector_named": (
+        "function(n) setNames(runif(n), paste0('gene', seq_len(n)))",
+        lambda n: pd.Series(np.random.random(n), index=[f"gene{i}" for i in range(n)]),
+    ),
+    "dataframe": (
+        """
+        function(n) data.frame(
+            x = runif(n), y = sample.int(100L, n, replace = TRUE),
+            z = runif(n) > 0.5, s = paste0('gene', seq_len(n))
+        )
+        """,
+        _dataframe,
+    ),
+    "factor": (
+        "function(n) factor(sample(letters, n, replace = TRUE))",
+        lambda n: pd.Series(pd.Categorical(np.random.choice(list("abcdef"), n))),
+    ),
+    "date": (
+        "function(n) as.Date('2000-01-01') + seq_len(n) %% 10000L",
+        lambda n: np.datetime64("2000-01-01") + np.arange(n) % 10000,
+    ),
+    "sf": (
+        "function(n) sf::st_as_sf(data.frame(x = runif(n), a = runif(n), b = runif(n)), coords = c('a', 'b'), crs = 4326)",
+        _sf,
+    ),
+    "igraph": ("function(n) igraph::make_ring(n)", _graph),
+    "nested_list": (
+        "function(n) lapply(seq_len(n %/% 3), function(i) list(a = i, b = c(i, 2)))",
+        _nested_list,
+    ),
+}
@@ -0,0 +1,161 @@
+"""Measure time and peak memory of Py<->R conversions at increasing sizes.
+
+Each measurement runs in a fresh process, so that peak RSS values are not
+influenced by previous runs. Results are stored as JSON and can be compared
+across commits:
+
+    python benchmarks/run.py run --sizes 1e3 1e5 1e7 --output before.json
+    python benchmarks/run.py run --sizes 1e3 1e5 1e7 --output after.json
+    python benchmarks/run.py compare before.json after.json
+"""
+
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+import resource
+import subprocess
+
+from cases import CASES
+
+
+DIRECTIONS = ["rpy2py", "py2rpy"]
+
+
+def measure(case, direction, size, repeats):
+    """Run single benchmark in current process."""
+    import rpy2.rinterface as ri
+    from rpy2.robjects.conversion import localconverter
+
+    from rwrap.converter import converter, rcall, rfunc_cached
+
+    r_code, py_func = CASES[case]
+
+    with localconverter(converter) as cv:
+        if direction == "rpy2py":
+            obj = rcall(rfunc_cached(r_code), ri.IntSexpVector([size]))
+            func = cv.rpy2py
+        else:
+            obj = py_func(size)
+            func = cv.py2rpy
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        times = timeit.repeat(lambda: func(obj), number=1, repeat=repeats)
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "case": case,
+        "direction": direction,
+        "size": size,
+        "time": min(times),
+        "times": times,
+        "peak_rss_increase": rss_after - rss_before,  # KiB on Linux
+        "peak_rss": rss_after,
+    }
+
+
+def run(args):
+    results = []
+    for case in args.cases:
+        for direction in args.directions:
+            for size in args.sizes:
+                proc = subprocess.run(
+                    [
+                        sys.executable,
+                        __file__,
+                        "worker",
+                        case,
+                        direction,
+                        str(size),
+                        str(args.repeats),
+                    ],
+                    capture_output=True,
+                    text=True,
+                )
+                if proc.returncode != 0:
+                    print(f"{case} [{direction}, n={size}]: failed")
+                    print(proc.stderr, file=sys.stderr)
+                    continue
+
+                res = json.loads(proc.stdout.splitlines()[-1])
+                print(
+                    f"{case} [{direction}, n={size}]: {res['time']:.4f}s, "
+                    f"+{res['peak_rss_increase'] / 1024:.1f}MiB peak RSS"
+                )
+                results.append(res)
+
+    commit = subprocess.run(
+        ["git", "rev-parse", "HEAD"], capture_output=True, text=True
+    ).stdout.strip()
+    output = {
+        "metadata": {
+            "commit": commit,
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    with open(args.output, "w") as fd:
+        json.dump(output, fd, indent=2)
+
+
+def compare(args):
+    def load(fname):
+        with open(fname) as fd:
+            data = json.load(fd)
+        return {(r["case"], r["direction"], r["size"]): r for r in data["results"]}
+
+    base, new = load(args.base), load(args.new)
+
+    for key in sorted(base.keys() & new.keys()):
+        ratio = new[key]["time"] / base[key]["time"]
+        flag = " <-- slower" if ratio > 1 + args.threshold else ""
+        print(
+            f"{key[0]} [{key[1]}, n={key[2]}]: "
+            f"{base[key]['time']:.4f}s -> {new[key]['time']:.4f}s ({ratio:.2f}x){flag}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_run = subparsers.add_parser("run")
+    parser_run.add_argument("--cases", nargs="+", default=list(CASES), choices=CASES)
+    parser_run.add_argument("--directions", nargs="+", default=DIRECTIONS)
+    parser_run.add_argument(
+        "--sizes",
+        nargs="+",
+        type=lambda x: int(float(x)),
+        default=[10**3, 10**4, 10**5, 10**6, 10**7],
+    )
+    parser_run.add_argument("--repeats", type=int, default=3)
+    parser_run.add_argument("--output", default="benchmark_results.json")
+
+    parser_compare = subparsers.add_parser("compare")
+    parser_compare.add_argument("base")
+    parser_compare.add_argument("new")
+    parser_compare.add_argument("--threshold", type=float, default=0.1)
+
+    parser_worker = subparsers.add_parser("worker")
+    parser_worker.add_argument("case")
+    parser_worker.add_argument("direction")
+    parser_worker.add_argument("size", type=int)
+    parser_worker.add_argument("repeats", type=int)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run(args)
+    elif args.command == "compare":
+        compare(args)
+    elif args.command == "worker":
+        print(json.dumps(measure(args.case, args.direction, args.size, args.repeats)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,54 @@
 """Make using R packages from Python easier."""
 
+import os
+import importlib
 from importlib import metadata
 
 import rpy2.rinterface as ri
 
-from .wrapper import RLibraryWrapper
+from .wrapper import RLibraryWrapper, lazy
+from ._proxy import RObjectProxy, iter_chunks
+from .converter import register_class_converter
+from ._profiling import Profiler
+from ._executor import set_thread_safe
 
 
 __version__ = metadata.version("rwrap")
 
+# submodules which are only imported on access
+SUBMODULES = {"aio"}
+
+# public names of helper modules which are only imported on access
+LAZY_ATTRIBUTES = {
+    "RPool": "_pool",
+    "cached": "_cache",
+    "Pipeline": "_pipeline",
+    "enable_tracing": "_tracing",
+    "disable_tracing": "_tracing",
+    "add_listener": "_tracing",
+    "remove_listener": "_tracing",
+}
+
+if os.environ.get("RWRAP_TRACE", "0") not in ("", "0"):
+    # instruments converters on import
+    importlib.import_module("._tracing", __name__)
+
 
 def __getattr__(name: str) -> RLibraryWrapper:
+    if name in SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    if name in LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{LAZY_ATTRIBUTES[name]}", __name__)
+        globals()[name] = getattr(module, name)
+        return globals()[name]
+
     try:
-        return RLibraryWrapper(name)
+        lib = RLibraryWrapper(name)
     except ri.RRuntimeError:
         # TODO: use ModuleNotFoundError, ImportError
         raise AttributeError(f'Error while importing "{name}"')
+
+    # cache wrapper as module attribute, so that `__getattr__` is not called again
+    globals()[name] = lib
+    return lib
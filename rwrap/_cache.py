@@ -0,0 +1,239 @@
+"""Persistent on-disk cache for results of wrapped R function calls."""
+
+import os
+import time
+import hashlib
+import pathlib
+import tempfile
+from typing import Callable, Optional, Union
+
+import pandas as pd
+
+import rpy2.rinterface as ri
+from rpy2.robjects.conversion import localconverter
+
+from . import _executor
+from .converter import converter, importr_cached, rcall, rfunc_cached
+from ._pool import has_arrow
+from .wrapper import RLibraryWrapper, convert_arguments
+
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "RWRAP_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "rwrap")
+)
+
+# DataFrames are stored as Feather files (and not cached at all if `pyarrow` is
+# unavailable or cannot represent them), all other results as RDS files of the
+# unconverted R object, so that cached results always have the same type
+SUFFIXES = (".feather", ".rds")
+
+# returned by `CallCache.load` if there is no valid entry (results can be `None`)
+MISSING = object()
+
+
+def package_version(lib_name: str) -> str:
+    return rcall(
+        rfunc_cached("function(pkg) as.character(utils::packageVersion(pkg))"),
+        ri.StrSexpVector([lib_name]),
+    )[0]
+
+
+def has_references(values) -> bool:
+    """Check whether R objects contain environments or external pointers.
+
+    Their state is not part of their serialization, so they cannot be used as cache keys.
+    """
+    return rcall(
+        rfunc_cached(
+            """
+            function(values) {
+                check <- function(x) {
+                    if (typeof(x) %in% c("environment", "externalptr")) return(TRUE)
+                    if (is.list(x) && any(vapply(x, check, logical(1)))) return(TRUE)
+                    any(vapply(attributes(x), check, logical(1)))
+                }
+                check(values)
+            }
+            """
+        ),
+        ri.ListSexpVector(values),
+    )[0]
+
+
+def hash_call(package: str, version: str, name: str, args, kwargs) -> str:
+    """Hash function and serialized R arguments."""
+    serialize = rfunc_cached("function(x) serialize(x, NULL, version = 3)")
+
+    h = hashlib.sha256()
+    h.update(f"{package}\0{version}\0{name}\0".encode())
+    for key, value in [*enumerate(args), *sorted(kwargs.items())]:
+        h.update(f"{key}\0".encode())
+        h.update(rcall(serialize, value).memoryview())
+    return h.hexdigest()
+
+
+class CallCache:
+    """Directory of cached results.
+
+    Entries older than `ttl` seconds are ignored, the least recently used
+    entries are removed once the directory exceeds `max_size` bytes.
+    Files are replaced atomically, so that several processes can share a cache.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike, None] = None,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self.path = pathlib.Path(path or DEFAULT_CACHE_DIR)
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def load(self, key: str, cv):
+        """Return cached result or `MISSING`."""
+        for suffix in SUFFIXES:
+            fname = self.path / f"{key}{suffix}"
+
+            try:
+                # mtime is the creation time, atime the time of last use
+                mtime = fname.stat().st_mtime
+                if self.ttl is not None and time.time() - mtime > self.ttl:
+                    fname.unlink()
+                    continue
+
+                if suffix == ".feather":
+                    import pyarrow.feather
+
+                    res = pyarrow.feather.read_table(fname).to_pandas()
+                else:
+                    res = cv.rpy2py(
+                        rcall(rfunc_cached("readRDS"), ri.StrSexpVector([str(fname)]))
+                    )
+
+                os.utime(fname, (time.time(), mtime))
+            except FileNotFoundError:
+                # removed by concurrent eviction
+                continue
+
+            return res
+
+        return MISSING
+
+    def store(self, key: str, robj, res) -> None:
+        """Write R result `robj` (converted to `res`) to cache."""
+        table = None
+        if isinstance(res, pd.DataFrame):
+            if not has_arrow():
+                return
+
+            import pyarrow as pa
+
+            try:
+                table = pa.Table.from_pandas(res)
+            except (pa.ArrowException, TypeError, ValueError):
+                # e.g. columns of mixed types
+                return
+
+        suffix = ".rds" if table is None else ".feather"
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        os.close(fd)
+
+        try:
+            if table is None:
+                rcall(rfunc_cached("saveRDS"), robj, ri.StrSexpVector([tmp]))
+            else:
+                import pyarrow.feather
+
+                pyarrow.feather.write_feather(table, tmp)
+
+            os.replace(tmp, self.path / f"{key}{suffix}")
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        if self.max_size is not None:
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until cache is small enough."""
+        entries = []
+        for fname in self.path.iterdir():
+            if fname.suffix not in SUFFIXES:
+                continue
+            try:
+                stat = fname.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, fname))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, fname in sorted(entries):
+            if total <= self.max_size:
+                break
+
+            try:
+                fname.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class CachedLibraryWrapper:
+    """Wrapper of R package whose function results are cached on disk."""
+
+    def __init__(self, lib: RLibraryWrapper, cache: CallCache) -> None:
+        self.__lib_name = lib._lib_name
+        self.__cache = cache
+        self.__version = _executor.call_r(package_version, self.__lib_name)
+
+    def __getattr__(self, name: str) -> Callable:
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        func = getattr(_executor.call_r(importr_cached, self.__lib_name), name)
+        prm_translate = getattr(func, "_prm_translate", {})
+
+        def call(args, kwargs):
+            with localconverter(converter) as cv:
+                rargs, rkwargs = convert_arguments(args, kwargs, cv, prm_translate)
+                if has_references([*rargs, *rkwargs.values()]):
+                    # e.g. connections or R6 objects, bypass the cache
+                    return cv.rpy2py(rcall(func, *rargs, **rkwargs))
+
+                key = hash_call(self.__lib_name, self.__version, name, rargs, rkwargs)
+
+                res = self.__cache.load(key, cv)
+                if res is not MISSING:
+                    return res
+
+                robj = rcall(func, *rargs, **rkwargs)
+                res = cv.rpy2py(robj)
+
+                self.__cache.store(key, robj, res)
+                return res
+
+        def wrapper(*args, **kwargs):
+            # hashing, loading and storing access R as well
+            return _executor.call_r(call, args, kwargs)
+
+        return wrapper
+
+    def __repr__(self) -> str:
+        return f"<cached module '{self.__lib_name}' in '{self.__cache.path}'>"
+
+
+def cached(
+    lib: RLibraryWrapper,
+    path: Union[str, os.PathLike, None] = None,
+    max_size: Optional[int] = None,
+    ttl: Optional[float] = None,
+) -> CachedLibraryWrapper:
+    """Return variant of wrapped R package which caches results on disk.
+
+    Results are keyed by package name and version, function name and the
+    converted arguments. `max_size` is given in bytes, `ttl` in seconds.
+    """
+    return CachedLibraryWrapper(lib, CallCache(path, max_size=max_size, ttl=ttl))
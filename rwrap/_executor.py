@@ -0,0 +1,53 @@
+"""Dedicated thread which executes all R calls submitted to it."""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+
+# whether wrapped R calls from any thread are funneled through the R thread,
+# embedded R must not be accessed by several threads at the same time
+THREAD_SAFE = os.environ.get("RWRAP_THREAD_SAFE", "0") == "1"
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+_R_THREAD = threading.local()
+
+
+def _mark_r_thread() -> None:
+    _R_THREAD.active = True
+
+
+def in_r_thread() -> bool:
+    """Check whether current thread is the dedicated R thread."""
+    return getattr(_R_THREAD, "active", False)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return single-threaded executor which serializes access to embedded R."""
+    global _EXECUTOR
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="rwrap-R", initializer=_mark_r_thread
+            )
+        return _EXECUTOR
+
+
+def call_r(func: Callable, *args, **kwargs):
+    """Call function which accesses R, in the R thread if thread-safe mode is enabled.
+
+    Blocks until the result is available. Calls from within the R thread are executed directly.
+    """
+    if not THREAD_SAFE or in_r_thread():
+        return func(*args, **kwargs)
+    return get_executor().submit(func, *args, **kwargs).result()
+
+
+def set_thread_safe(enabled: bool = True) -> None:
+    """Enable (or disable) funneling all R accesses through the dedicated R thread."""
+    global THREAD_SAFE
+    THREAD_SAFE = enabled
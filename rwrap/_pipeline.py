@@ -0,0 +1,170 @@
+"""Record chains of R function calls and execute them in a single R round-trip."""
+
+import itertools
+from typing import Any, Callable, List, NamedTuple
+
+import rpy2.rinterface as ri
+from rpy2.robjects.conversion import localconverter
+
+from . import _executor
+from .converter import converter, importr_cached, rcall, rfunc_cached
+
+
+# unique per process, unlike `id()` which can be reused after garbage collection
+_PIPELINE_IDS = itertools.count()
+
+
+class PipelineRef:
+    """Symbolic result of a recorded call, can be passed to later calls.
+
+    References are only valid as top-level arguments of calls in the same pipeline,
+    they are deliberately not sequences, so that they are not converted to R vectors.
+    """
+
+    __slots__ = ("pipeline_id", "index")
+
+    def __init__(self, pipeline_id: int, index: int) -> None:
+        self.pipeline_id = pipeline_id
+        self.index = index
+
+    @property
+    def symbol(self) -> str:
+        return f".s{self.index}"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PipelineRef):
+            return NotImplemented
+        return (self.pipeline_id, self.index) == (other.pipeline_id, other.index)
+
+    def __hash__(self) -> int:
+        return hash((self.pipeline_id, self.index))
+
+    def __repr__(self) -> str:
+        return f"<PipelineRef {self.symbol} of pipeline {self.pipeline_id}>"
+
+
+@converter.py2rpy.register(PipelineRef)
+def _(obj):
+    raise TypeError(
+        "PipelineRef can only be passed as top-level argument of calls in its pipeline"
+    )
+
+
+class RecordedCall(NamedTuple):
+    package: str
+    function: str
+    args: tuple
+    kwargs: dict
+
+
+class PipelineLibrary:
+    """Record calls of functions of an R package in a `Pipeline`."""
+
+    def __init__(self, pipeline: "Pipeline", package: str) -> None:
+        self.__pipeline = pipeline
+        self.__package = package
+
+    def __getattr__(self, name: str) -> Callable[..., PipelineRef]:
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def wrapper(*args, **kwargs):
+            return self.__pipeline.record(self.__package, name, args, kwargs)
+
+        return wrapper
+
+
+class Pipeline:
+    """Chain of R function calls which is executed in R at once.
+
+    Intermediate results stay in R, only requested outputs are converted:
+
+        p = rwrap.Pipeline()
+        dds = p.DESeq2.DESeqDataSetFromMatrix(countData=df, colData=meta, design=design)
+        dds = p.DESeq2.DESeq(dds)
+        res = p.run(p.DESeq2.results(dds))
+    """
+
+    def __init__(self) -> None:
+        self.pipeline_id = next(_PIPELINE_IDS)
+        self.calls: List[RecordedCall] = []
+
+    def record(self, package: str, function: str, args, kwargs) -> PipelineRef:
+        """Add call of `package::function` and return reference to its result."""
+        for value in [*args, *kwargs.values()]:
+            if isinstance(value, PipelineRef):
+                self.check_ref(value)
+
+        self.calls.append(
+            RecordedCall(package.replace("_", "."), function, args, kwargs)
+        )
+        return PipelineRef(self.pipeline_id, len(self.calls) - 1)
+
+    def check_ref(self, ref: PipelineRef) -> None:
+        """Raise `ValueError` if `ref` is not a result of this pipeline."""
+        if ref.pipeline_id != self.pipeline_id or not 0 <= ref.index < len(self.calls):
+            raise ValueError("Result of a different pipeline cannot be used")
+
+    def __getattr__(self, name: str) -> PipelineLibrary:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return PipelineLibrary(self, name)
+
+    def build(self, env: ri.SexpEnvironment, cv) -> str:
+        """Assign functions and converted arguments in `env` and return R code of all calls."""
+        lines = []
+        for i, call in enumerate(self.calls):
+            func = getattr(importr_cached(call.package), call.function)
+            prm_translate = getattr(func, "_prm_translate", {})
+            env[f".f{i}"] = func
+
+            params = []
+            for j, (key, value) in enumerate(
+                [*((None, a) for a in call.args), *call.kwargs.items()]
+            ):
+                if isinstance(value, PipelineRef):
+                    expr = value.symbol
+                else:
+                    expr = f".a{i}_{j}"
+                    env[expr] = (
+                        value if isinstance(value, ri.Sexp) else cv.py2rpy(value)
+                    )
+
+                if key is None:
+                    params.append(expr)
+                else:
+                    params.append(f"`{prm_translate.get(key, key)}` = {expr}")
+
+            lines.append(f".s{i} <- .f{i}({', '.join(params)})")
+
+        return "\n".join(lines)
+
+    def run(self, *outputs: PipelineRef) -> Any:
+        """Execute recorded calls and convert requested outputs (default: last result)."""
+        if not self.calls:
+            raise ValueError("Pipeline has no recorded calls")
+        if not outputs:
+            outputs = (PipelineRef(self.pipeline_id, len(self.calls) - 1),)
+        for ref in outputs:
+            if not isinstance(ref, PipelineRef):
+                raise TypeError(f"Outputs must be PipelineRefs, not {type(ref)}")
+            self.check_ref(ref)
+
+        res = _executor.call_r(self.execute, outputs)
+        return res[0] if len(res) == 1 else res
+
+    def execute(self, outputs) -> tuple:
+        """Evaluate recorded calls in R and convert `outputs` (accesses R)."""
+        with localconverter(converter) as cv:
+            env = ri.baseenv["new.env"]()
+            code = self.build(env, cv)
+
+            rcall(
+                rfunc_cached(
+                    "function(code, env) eval(parse(text = code), envir = env)"
+                ),
+                ri.StrSexpVector([code]),
+                env,
+            )
+
+            return tuple(cv.rpy2py(env[ref.symbol]) for ref in outputs)
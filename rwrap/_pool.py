@@ -0,0 +1,166 @@
+"""Run R function calls in parallel using a pool of worker processes."""
+
+import pickle
+import functools
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+import pandas as pd
+
+
+# wrapped packages of current worker process
+WORKER_LIBS = {}
+
+
+def _dataframe_from_ipc(buf):
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(buf).read_all().to_pandas()
+
+
+class ArrowFrame:
+    """Pickle DataFrame as Arrow IPC stream instead of pickling its columns."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+
+    def __reduce_ex__(self, protocol):
+        import pyarrow as pa
+
+        try:
+            table = pa.Table.from_pandas(self.df)
+        except (pa.ArrowException, ValueError, TypeError):
+            # e.g. columns of mixed types or duplicate column names
+            return pickle.loads, (pickle.dumps(self.df, protocol=protocol),)
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        # unpickling yields the DataFrame itself
+        return _dataframe_from_ipc, (sink.getvalue(),)
+
+
+def has_arrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def encode(obj, use_arrow: bool):
+    """Prepare object for being sent to or from a worker process."""
+    if isinstance(obj, pd.DataFrame):
+        return ArrowFrame(obj) if use_arrow else obj
+    elif isinstance(obj, (list, tuple)):
+        return type(obj)(encode(o, use_arrow) for o in obj)
+    elif isinstance(obj, dict):
+        return {k: encode(v, use_arrow) for k, v in obj.items()}
+    return obj
+
+
+def _init_worker(packages: Sequence[str]) -> None:
+    """Start embedded R and import packages once per worker."""
+    from .wrapper import RLibraryWrapper
+
+    for package in packages:
+        WORKER_LIBS[package] = RLibraryWrapper(package)
+
+
+def _run(package: str, name: str, args, kwargs, use_arrow: bool):
+    from .wrapper import RLibraryWrapper
+
+    try:
+        lib = WORKER_LIBS[package]
+    except KeyError:
+        lib = WORKER_LIBS[package] = RLibraryWrapper(package)
+
+    res = getattr(lib, name)(*args, **kwargs)
+    return encode(res, use_arrow)
+
+
+def _run_star(package: str, name: str, use_arrow: bool, args):
+    return _run(package, name, args, {}, use_arrow)
+
+
+class PoolLibrary:
+    """Access functions of R package which are executed in a `RPool`."""
+
+    def __init__(self, pool: "RPool", package: str) -> None:
+        self.__pool = pool
+        self.__package = package
+
+    def __getattr__(self, name: str) -> Callable[..., Future]:
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def wrapper(*args, **kwargs):
+            return self.__pool.submit(self.__package, name, *args, **kwargs)
+
+        return wrapper
+
+    def __repr__(self) -> str:
+        return f"<pooled module '{self.__package}'>"
+
+
+class RPool:
+    """Pool of worker processes, each running its own embedded R.
+
+    Functions of R packages are called as `pool.<package>.<function>(...)`,
+    which returns a `concurrent.futures.Future`.
+    DataFrames are transferred as Arrow IPC streams if `pyarrow` is installed.
+    """
+
+    def __init__(
+        self,
+        packages: Sequence[str] = (),
+        max_workers: Optional[int] = None,
+        use_arrow: Optional[bool] = None,
+    ) -> None:
+        self.packages = [p.replace("_", ".") for p in packages]
+        self.use_arrow = has_arrow() if use_arrow is None else use_arrow
+
+        # forking a process with an initialized R is not safe
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.packages,),
+        )
+
+    def submit(self, package: str, name: str, *args, **kwargs) -> Future:
+        """Schedule call of `package::name` in worker process."""
+        return self.executor.submit(
+            _run,
+            package.replace("_", "."),
+            name,
+            encode(args, self.use_arrow),
+            encode(kwargs, self.use_arrow),
+            self.use_arrow,
+        )
+
+    def map(
+        self, package: str, name: str, *iterables: Iterable, chunksize: int = 1
+    ) -> Iterator:
+        """Call `package::name` for each element of the iterables in parallel."""
+        func = functools.partial(
+            _run_star, package.replace("_", "."), name, self.use_arrow
+        )
+        args = (encode(args, self.use_arrow) for args in zip(*iterables))
+        return self.executor.map(func, args, chunksize=chunksize)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait)
+
+    def __getattr__(self, name: str) -> PoolLibrary:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return PoolLibrary(self, name)
+
+    def __enter__(self) -> "RPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
@@ -0,0 +1,133 @@
+"""Opt-in profiling of calls to wrapped R functions."""
+
+import json
+import contextlib
+from typing import List, NamedTuple, Optional
+
+import pandas as pd
+
+import rpy2.rinterface as ri
+
+from .converter import rcall, rfunc_cached
+
+
+class CallRecord(NamedTuple):
+    """Timings (in seconds) and object sizes (in bytes) of a single R function call."""
+
+    package: str
+    function: str
+    start: float  # `time.perf_counter()` at start of call
+    argument_conversion: float
+    r_execution: float
+    result_conversion: float
+    argument_size: int
+    result_size: int
+
+
+# profilers which are currently recording
+ACTIVE_PROFILERS = []
+
+
+def add_record(record: CallRecord) -> None:
+    """Pass record of a finished call to all active profilers."""
+    for profiler in ACTIVE_PROFILERS:
+        profiler.records.append(record)
+
+
+def object_size(obj: ri.Sexp) -> int:
+    """Return memory size of R object as estimated by `utils::object.size`."""
+    size = rcall(rfunc_cached("function(x) as.numeric(utils::object.size(x))"), obj)
+    return int(size[0])
+
+
+class Profiler(contextlib.ContextDecorator):
+    """Record timings of wrapped R function calls.
+
+    Each call is split into argument conversion (Py->R), R execution and
+    result conversion (R->Py). Can be used as context manager or decorator:
+
+        with rwrap.Profiler() as prof:
+            res = DESeq2.results(dds)
+        print(prof.summary())
+    """
+
+    def __init__(self) -> None:
+        self.records: List[CallRecord] = []
+
+    def __enter__(self) -> "Profiler":
+        ACTIVE_PROFILERS.append(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        ACTIVE_PROFILERS.remove(self)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return one row per recorded call."""
+        return pd.DataFrame(self.records, columns=CallRecord._fields)
+
+    def summary(self) -> pd.DataFrame:
+        """Return call counts, total times and mean object sizes per R function."""
+        df = self.to_dataframe()
+
+        return (
+            df.groupby(["package", "function"])
+            .agg(
+                calls=("start", "size"),
+                argument_conversion=("argument_conversion", "sum"),
+                r_execution=("r_execution", "sum"),
+                result_conversion=("result_conversion", "sum"),
+                argument_size=("argument_size", "mean"),
+                result_size=("result_size", "mean"),
+            )
+            .sort_values("r_execution", ascending=False)
+        )
+
+    def to_chrome_trace(self, fname: Optional[str] = None) -> dict:
+        """Return (and optionally save) calls in Chrome's trace event format.
+
+        The result can be inspected with `chrome://tracing` or https://ui.perfetto.dev.
+        """
+        events = []
+        for record in self.records:
+            name = f"{record.package}::{record.function}"
+            start = record.start * 1e6  # microseconds
+
+            phases = [
+                (
+                    name,
+                    0,
+                    record.argument_conversion
+                    + record.r_execution
+                    + record.result_conversion,
+                ),
+                ("argument conversion", 0, record.argument_conversion),
+                ("R execution", record.argument_conversion, record.r_execution),
+                (
+                    "result conversion",
+                    record.argument_conversion + record.r_execution,
+                    record.result_conversion,
+                ),
+            ]
+            for phase, offset, duration in phases:
+                events.append(
+                    {
+                        "name": phase,
+                        "cat": name,
+                        "ph": "X",
+                        "ts": start + offset * 1e6,
+                        "dur": duration * 1e6,
+                        "pid": 0,
+                        "tid": 0,
+                        "args": {
+                            "argument_size": record.argument_size,
+                            "result_size": record.result_size,
+                        },
+                    }
+                )
+
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+
+        if fname is not None:
+            with open(fname, "w") as fd:
+                json.dump(trace, fd)
+        return trace
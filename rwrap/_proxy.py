@@ -0,0 +1,146 @@
+"""Lazy handles of R objects which are only converted when accessed from Python."""
+
+from typing import Any, Iterator, Union
+
+import numpy as np
+
+import rpy2.rinterface as ri
+from rpy2.robjects.conversion import localconverter
+
+from . import _executor
+from .converter import (
+    CLASS_CONVERTERS,
+    converter,
+    convert_dataframe,
+    convert_matrix,
+    rcall,
+    rfunc_cached,
+    use_arrow,
+)
+
+
+_MISSING = object()
+
+
+class RObjectProxy:
+    """Handle of R object which defers its conversion to Python.
+
+    The object is converted once Python actually touches it,
+    e.g. by attribute access, `np.asarray`, `len` or indexing.
+    Passing the handle back to a wrapped R function does not convert anything.
+    """
+
+    def __init__(self, robj: ri.Sexp) -> None:
+        self._robj = robj
+        self._value = _MISSING
+
+    @property
+    def robj(self) -> ri.Sexp:
+        """Underlying R object."""
+        return self._robj
+
+    def materialize(self) -> Any:
+        """Convert R object to Python (only once)."""
+        if self._value is _MISSING:
+            if self._robj is None:
+                raise ValueError("R object was released by `iter_chunks`")
+
+            self._value = _executor.call_r(self._convert)
+        return self._value
+
+    def _convert(self) -> Any:
+        with localconverter(converter) as cv:
+            return cv.rpy2py(self._robj)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("_robj", "_value"):
+            # not initialized yet (e.g. during copying)
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+    def __array__(self, dtype=None) -> np.ndarray:
+        return np.asarray(self.materialize(), dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.materialize())
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.materialize()[key]
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def iter_chunks(self, chunksize: int = 100_000, release: bool = False) -> Iterator:
+        """Convert R data.frame or matrix in chunks of rows, see `iter_chunks`."""
+        return iter_chunks(self, chunksize=chunksize, release=release)
+
+    def __repr__(self) -> str:
+        if self._robj is None:
+            return "<RObjectProxy (released)>"
+        if self._value is _MISSING:
+            rclass = _executor.call_r(lambda: list(self._robj.rclass))
+            return f"<RObjectProxy of R class {rclass}>"
+        return repr(self._value)
+
+
+@converter.py2rpy.register(RObjectProxy)
+def _(obj):
+    return obj.robj
+
+
+def iter_chunks(
+    obj: Union[RObjectProxy, ri.Sexp], chunksize: int = 100_000, release: bool = False
+) -> Iterator:
+    """Convert R data.frame or matrix to Python in chunks of `chunksize` rows.
+
+    Data.frames yield DataFrames, matrices NumPy arrays,
+    so that at most one chunk needs to be held in Python memory at a time.
+    All chunks have the same type and dtypes, as the conversion path
+    (e.g. the Arrow transfer) is chosen once based on the size of the whole object.
+    If `release` is set, a given proxy drops its R object, which can then be
+    garbage collected by R once all chunks have been consumed.
+    """
+    if isinstance(obj, RObjectProxy):
+        robj = obj.robj
+        if release:
+            obj._robj = None
+    else:
+        robj = obj
+
+    rclass = _executor.call_r(lambda: set(robj.rclass))
+    if "data.frame" in rclass:
+        is_matrix = False
+    elif "matrix" in rclass:
+        is_matrix = True
+    else:
+        raise TypeError(f"Cannot chunk R object of class {sorted(rclass)}")
+
+    def setup():
+        nrow = ri.baseenv["nrow"](robj)[0]
+        return nrow, not is_matrix and use_arrow(nrow)
+
+    def convert_chunk(start, end, arrow):
+        chunk = rcall(
+            rfunc_cached("function(x, i, j) x[i:j, , drop = FALSE]"),
+            robj,
+            ri.IntSexpVector([start + 1]),
+            ri.IntSexpVector([end]),
+        )
+
+        if is_matrix:
+            # chunks are fresh subsets, copying them gives all chunks the same (writable) semantics
+            return convert_matrix(chunk, copy=True)
+        elif CLASS_CONVERTERS.resolve(chunk) is convert_dataframe:
+            return convert_dataframe(chunk, arrow=arrow)
+        with localconverter(converter) as cv:
+            return cv.rpy2py(chunk)
+
+    def generate():
+        # each chunk is subset and converted in the R thread (in thread-safe mode)
+        nrow, arrow = _executor.call_r(setup)
+
+        for start in range(0, nrow, chunksize):
+            end = min(start + chunksize, nrow)
+            yield _executor.call_r(convert_chunk, start, end, arrow)
+
+    return generate()
@@ -0,0 +1,146 @@
+"""Opt-in instrumentation of Py<->R conversions.
+
+When tracing is disabled (the default), the converters run without any overhead.
+Enabling it (via `enable_tracing()` or the environment variable `RWRAP_TRACE=1`)
+wraps every registered converter and emits a `ConversionEvent` per conversion.
+"""
+
+import os
+import time
+import functools
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from loguru import logger
+
+import rpy2.rinterface as ri
+
+from .converter import REGISTRATION_HOOKS, converter
+
+
+class ConversionEvent(NamedTuple):
+    """Single Py<->R conversion."""
+
+    direction: str  # "py2rpy" or "rpy2py"
+    rclass: Tuple[str, ...]  # class of the R object
+    pytype: str  # type of the Python object
+    length: Optional[int]  # number of elements of the R object
+    nbytes: Optional[int]  # size of the data in bytes (if known)
+    elapsed: float  # in seconds
+
+
+# element sizes of atomic R vectors
+RTYPE_SIZES = {
+    ri.RTYPES.LGLSXP: 4,
+    ri.RTYPES.INTSXP: 4,
+    ri.RTYPES.REALSXP: 8,
+    ri.RTYPES.CPLXSXP: 16,
+    ri.RTYPES.RAWSXP: 1,
+}
+
+
+def _log_event(event: ConversionEvent) -> None:
+    logger.bind(**event._asdict()).debug(
+        "{direction}: {pytype} [{rclass}], length={length}, nbytes={nbytes}, {elapsed:.6f}s",
+        **event._asdict(),
+    )
+
+
+LISTENERS = [_log_event]
+_ORIGINAL_HANDLERS = {}  # (direction, type) -> unwrapped handler
+_TRACED_HANDLERS = {}  # (direction, type) -> instrumented handler
+
+
+def add_listener(func: Callable[[ConversionEvent], None]) -> None:
+    """Call `func` with each `ConversionEvent` while tracing is enabled."""
+    LISTENERS.append(func)
+
+
+def remove_listener(func: Callable[[ConversionEvent], None]) -> None:
+    """Stop calling `func` with `ConversionEvent`s."""
+    LISTENERS.remove(func)
+
+
+def _create_event(direction, robj, pyobj, elapsed):
+    rclass, length, nbytes = (), None, None
+
+    if isinstance(robj, ri.Sexp):
+        rclass = tuple(robj.rclass)
+
+        if isinstance(robj, ri.SexpVector):
+            length = len(robj)
+            if robj.typeof in RTYPE_SIZES:
+                nbytes = length * RTYPE_SIZES[robj.typeof]
+
+    if nbytes is None:
+        nbytes = getattr(pyobj, "nbytes", None)
+        if not isinstance(nbytes, int):
+            # e.g. properties which are not evaluated on classes
+            nbytes = None
+
+    return ConversionEvent(
+        direction, rclass, type(pyobj).__name__, length, nbytes, elapsed
+    )
+
+
+def _traced(direction, handler):
+    @functools.wraps(handler)
+    def wrapper(obj):
+        start = time.perf_counter()
+        res = handler(obj)
+        elapsed = time.perf_counter() - start
+
+        if direction == "py2rpy":
+            event = _create_event(direction, res, obj, elapsed)
+        else:
+            event = _create_event(direction, obj, res, elapsed)
+
+        for listener in LISTENERS:
+            listener(event)
+
+        return res
+
+    return wrapper
+
+
+def is_tracing_enabled() -> bool:
+    """Return whether conversions are currently traced."""
+    return instrument_handlers in REGISTRATION_HOOKS
+
+
+def instrument_handlers() -> None:
+    """Wrap all registered converters which are not instrumented yet."""
+    for direction in ("py2rpy", "rpy2py"):
+        dispatcher = getattr(converter, direction)
+
+        for type_, handler in list(dispatcher.registry.items()):
+            if _TRACED_HANDLERS.get((direction, type_)) is handler:
+                continue
+
+            traced = _traced(direction, handler)
+            _ORIGINAL_HANDLERS[direction, type_] = handler
+            _TRACED_HANDLERS[direction, type_] = traced
+            dispatcher.register(type_, traced)
+
+
+def enable_tracing() -> None:
+    """Instrument all registered converters, including those registered later on demand."""
+    if is_tracing_enabled():
+        return
+
+    instrument_handlers()
+    REGISTRATION_HOOKS.append(instrument_handlers)
+
+
+def disable_tracing() -> None:
+    """Restore uninstrumented converters."""
+    if is_tracing_enabled():
+        REGISTRATION_HOOKS.remove(instrument_handlers)
+
+    for (direction, type_), handler in _ORIGINAL_HANDLERS.items():
+        getattr(converter, direction).register(type_, handler)
+    _ORIGINAL_HANDLERS.clear()
+    _TRACED_HANDLERS.clear()
+
+
+if os.environ.get("RWRAP_TRACE", "0") not in ("", "0"):
+    enable_tracing()
@@ -0,0 +1,82 @@
+"""Call wrapped R functions from asyncio without blocking the event loop.
+
+Usage: `res = await rwrap.aio.DESeq2.DESeq(dds)`.
+
+Awaitable calls always run in the dedicated R thread. Synchronous calls which may
+overlap with them should be funneled through it as well, see `rwrap.set_thread_safe`.
+"""
+
+import asyncio
+import functools
+import weakref
+from typing import Awaitable, Callable
+
+from ._executor import get_executor
+from .wrapper import RLibraryWrapper
+
+
+# maximum number of calls which are queued or running at the same time,
+# further calls wait (without blocking the event loop) until a slot becomes free
+MAX_PENDING = 100
+
+_SEMAPHORES = weakref.WeakKeyDictionary()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    try:
+        return _SEMAPHORES[loop]
+    except KeyError:
+        sem = _SEMAPHORES[loop] = asyncio.Semaphore(MAX_PENDING)
+        return sem
+
+
+async def run_in_r_thread(func: Callable, *args, **kwargs):
+    """Execute function in the dedicated R thread.
+
+    Cancelling a call which has not started yet removes it from the queue,
+    running R code is not interrupted and its result is discarded.
+    """
+    async with _get_semaphore():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_executor(), functools.partial(func, *args, **kwargs)
+        )
+
+
+class AsyncLibraryWrapper:
+    """Wrapper of R package whose functions return awaitables."""
+
+    def __init__(self, lib_name: str) -> None:
+        # R package is imported in the R thread on first call
+        self.__lib_name = lib_name
+        self.__lib = None
+
+    def _get_lib(self) -> RLibraryWrapper:
+        if self.__lib is None:
+            self.__lib = RLibraryWrapper(self.__lib_name)
+        return self.__lib
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable]:
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return getattr(self._get_lib(), name)(*args, **kwargs)
+
+        async def wrapper(*args, **kwargs):
+            return await run_in_r_thread(call, *args, **kwargs)
+
+        return wrapper
+
+    def __repr__(self) -> str:
+        return f"<async module '{self.__lib_name}'>"
+
+
+def __getattr__(name: str) -> AsyncLibraryWrapper:
+    if name.startswith("__"):
+        raise AttributeError(name)
+
+    lib = AsyncLibraryWrapper(name)
+    globals()[name] = lib
+    return lib
@@ -0,0 +1,188 @@
+"""Transfer data.frames between R and pandas via the Arrow C data interface.
+
+Requires `pyarrow` in Python and the `arrow` package in R.
+Numeric columns are not copied between the two Arrow implementations,
+factors and strings are dictionary- and UTF-8-encoded respectively.
+"""
+
+import numpy as np
+import pandas as pd
+
+import rpy2.rinterface as ri
+
+from .converter import (
+    INT32_MIN,
+    INT32_MAX,
+    get_tzone,
+    offsets_to_dates,
+    offsets_to_datetimes,
+    rcall,
+    rfunc_cached,
+)
+
+
+_AVAILABLE = None
+
+# column types which can be exported by R's arrow package
+ARROW_RTYPES = {
+    ri.RTYPES.REALSXP,
+    ri.RTYPES.INTSXP,
+    ri.RTYPES.LGLSXP,
+    ri.RTYPES.STRSXP,
+}
+
+# column classes which are converted to the same dtypes as by `convert_column`
+ARROW_RCLASSES = {
+    "numeric",
+    "integer",
+    "character",
+    "logical",
+    "factor",
+    "ordered",
+    "Date",
+    "POSIXct",
+    "POSIXt",
+}
+
+# seconds per unit of Arrow timestamps
+TIME_UNITS = {"s": 1, "ms": 1e3, "us": 1e6, "ns": 1e9}
+
+
+def is_available() -> bool:
+    """Check whether `pyarrow` and the R package `arrow` are installed."""
+    global _AVAILABLE
+
+    if _AVAILABLE is None:
+        try:
+            import pyarrow.cffi  # noqa: F401
+        except ImportError:
+            _AVAILABLE = False
+        else:
+            _AVAILABLE = bool(ri.baseenv["requireNamespace"]("arrow", quietly=True)[0])
+
+    return _AVAILABLE
+
+
+def _new_c_structs():
+    """Allocate ArrowArray/ArrowSchema structs and return them with their addresses."""
+    from pyarrow.cffi import ffi
+
+    c_array = ffi.new("struct ArrowArray*")
+    c_schema = ffi.new("struct ArrowSchema*")
+
+    # R's arrow package accepts addresses as doubles
+    ptr_array = int(ffi.cast("uintptr_t", c_array))
+    ptr_schema = int(ffi.cast("uintptr_t", c_schema))
+
+    return (c_array, c_schema), ptr_array, ptr_schema
+
+
+def rdataframe_to_pandas(obj):
+    """Convert data.frame (or tibble) to pandas DataFrame.
+
+    Returns `None` if the data.frame contains columns which Arrow cannot represent.
+    """
+    import pyarrow as pa
+
+    columns = list(ri.ListSexpVector(obj))
+    if any(
+        col.typeof not in ARROW_RTYPES or not set(col.rclass) <= ARROW_RCLASSES
+        for col in columns
+    ):
+        return None
+
+    structs, ptr_array, ptr_schema = _new_c_structs()
+    try:
+        rcall(
+            rfunc_cached(
+                """
+                function(df, ptr_array, ptr_schema) {
+                    arrow::record_batch(df)$export_to_c(ptr_array, ptr_schema)
+                }
+                """
+            ),
+            obj,
+            ri.FloatSexpVector([ptr_array]),
+            ri.FloatSexpVector([ptr_schema]),
+        )
+    except ri.embedded.RRuntimeError:
+        return None
+    batch = pa.RecordBatch._import_from_c(ptr_array, ptr_schema)
+
+    data = {i: _column_to_pandas(batch.column(i), col) for i, col in enumerate(columns)}
+    df = pd.DataFrame(data, index=list(ri.baseenv["rownames"](obj)), copy=False)
+    # column names can be duplicated
+    df.columns = batch.schema.names
+    return df
+
+
+def _column_to_pandas(arr, col):
+    """Convert Arrow array to the same dtype as `convert_column` does for R column `col`."""
+    import pyarrow as pa
+
+    if pa.types.is_date32(arr.type):
+        offsets = arr.cast(pa.int32()).to_numpy(zero_copy_only=False)
+        return offsets_to_dates(offsets).array
+    if pa.types.is_timestamp(arr.type):
+        offsets = arr.cast(pa.int64()).to_numpy(zero_copy_only=False)
+        # time zone is taken from R, as arrow fills in the session time zone if missing
+        return offsets_to_datetimes(
+            offsets / TIME_UNITS[arr.type.unit], get_tzone(col)
+        ).array
+
+    types_mapper = {pa.int32(): pd.Int32Dtype(), pa.bool_(): pd.BooleanDtype()}.get
+    return arr.to_pandas(types_mapper=types_mapper).array
+
+
+def _column_to_arrow(col):
+    import pyarrow as pa
+
+    if isinstance(col.dtype, np.dtype) and col.dtype.kind in "iu":
+        # R has no 64 bit integers
+        values = col.to_numpy()
+        if values.size == 0 or (values.min() > INT32_MIN and values.max() <= INT32_MAX):
+            return pa.array(values.astype(np.int32))
+        return pa.array(values.astype(np.float64))
+
+    return pa.array(col, from_pandas=True)
+
+
+def pandas_to_rdataframe(df):
+    """Convert pandas DataFrame to data.frame.
+
+    Returns `None` if the DataFrame contains columns which Arrow cannot represent
+    or has duplicated row names, which R does not allow.
+    """
+    import pyarrow as pa
+
+    if not df.index.is_unique:
+        # the column-wise conversion handles them (with a warning)
+        return None
+
+    try:
+        batch = pa.RecordBatch.from_arrays(
+            [_column_to_arrow(col) for _, col in df.items()],
+            names=[str(name) for name in df.columns],
+        )
+    except (pa.ArrowException, ValueError, TypeError):
+        return None
+
+    structs, ptr_array, ptr_schema = _new_c_structs()
+    batch._export_to_c(ptr_array, ptr_schema)
+
+    return rcall(
+        rfunc_cached(
+            """
+            function(ptr_array, ptr_schema, rownames) {
+                batch <- arrow::RecordBatch$import_from_c(ptr_array, ptr_schema)
+                df <- as.data.frame(batch)
+                class(df) <- "data.frame"
+                rownames(df) <- rownames
+                df
+            }
+            """
+        ),
+        ri.FloatSexpVector([ptr_array]),
+        ri.FloatSexpVector([ptr_schema]),
+        ri.StrSexpVector(df.index.astype(str)),
+    )
@@ -1,16 +1,14 @@
 """Implement opinionated Py<->R conversion functions."""
 
+import os
+import array
+import threading
 import datetime
-import tempfile
-import collections
-
-from loguru import logger
+import collections.abc
+from typing import Callable, NamedTuple
 
 import numpy as np
 import pandas as pd
-import geopandas as gpd
-from shapely import geometry
-import igraph
 
 import rpy2.robjects as ro
 import rpy2.rinterface as ri
@@ -21,21 +19,62 @@ from rpy2.robjects import numpy2ri, pandas2ri
 from rpy2.robjects.conversion import converter as template_converter, Converter
 
 
+# conversion settings
+# how atomic R vectors (numeric, integer, logical, character) are converted:
+# * "list": Python lists (dicts for named vectors)
+# * "numpy": NumPy arrays (pandas Series for named vectors)
+VECTOR_MODE = os.environ.get("RWRAP_VECTOR_MODE", "list")
+
+# how data.frames are transferred:
+# * "auto": via the Arrow C data interface if `pyarrow` and the R package `arrow`
+#   are installed and the data.frame has at least `ARROW_MIN_ROWS` rows
+# * "never": column-wise conversion
+ARROW_MODE = os.environ.get("RWRAP_ARROW_MODE", "auto")
+ARROW_MIN_ROWS = 10_000
+
+# numeric matrices with at least this many elements are exchanged without
+# intermediate copies: R matrices become read-only views of R's memory,
+# NumPy arrays (including `np.memmap`s) are written directly into newly allocated R matrices
+LARGE_MATRIX_SIZE = int(os.environ.get("RWRAP_LARGE_MATRIX_SIZE", 1_000_000))
+
+
 # helper for cached R imports
 R_MODULE_DICT = {}
+R_MODULE_LOCK = threading.RLock()
 
 
 def importr_cached(pkg_name, reload=False):
     """`importr` with caching."""
-    if reload and pkg_name in R_MODULE_DICT:
-        del R_MODULE_DICT[pkg_name]
+    with R_MODULE_LOCK:
+        if reload and pkg_name in R_MODULE_DICT:
+            del R_MODULE_DICT[pkg_name]
 
-    # prevent crash: "rpy2.robjects.packages.LibraryError: The symbol .env in the package "igraph" is conflicting with a Python object attribute"
-    robject_translations = {".env": "__env"}
+        # prevent crash: "rpy2.robjects.packages.LibraryError: The symbol .env in the package "igraph" is conflicting with a Python object attribute"
+        robject_translations = {".env": "__env"}
 
-    return R_MODULE_DICT.setdefault(
-        pkg_name, importr(pkg_name, robject_translations=robject_translations)
-    )
+        if pkg_name not in R_MODULE_DICT:
+            R_MODULE_DICT[pkg_name] = importr(
+                pkg_name, robject_translations=robject_translations
+            )
+        return R_MODULE_DICT[pkg_name]
+
+
+def rcall(func, *args, **kwargs):
+    """Call R function with R arguments and return the unconverted result."""
+    return ri.SexpClosure.__call__(func, *args, **kwargs)
+
+
+# helper for R functions which are only parsed once
+R_FUNCTION_DICT = {}
+R_FUNCTION_LOCK = threading.RLock()
+
+
+def rfunc_cached(code):
+    """Evaluate R function definition once and reuse the resulting function."""
+    with R_FUNCTION_LOCK:
+        if code not in R_FUNCTION_DICT:
+            R_FUNCTION_DICT[code] = ro.r(code)
+        return R_FUNCTION_DICT[code]
 
 
 # setup converter
@@ -47,138 +86,813 @@ converter = Converter("rwrap", template=template_converter)
 # None type
 @converter.py2rpy.register(type(None))
 def _(obj):
-    logger.trace(f"py2rpy::None")
     return ri.NULLType
 
 
 @converter.rpy2py.register(ri.NULLType)
 def _(obj):
-    logger.trace(f"rpy2py::ri.NULLType")
     return None
 
 
 # special classes
+ATOMIC_TYPES = {
+    ri.RTYPES.REALSXP,
+    ri.RTYPES.INTSXP,
+    ri.RTYPES.LGLSXP,
+    ri.RTYPES.STRSXP,
+}
+NA_INTEGER = np.iinfo(np.int32).min  # also used for NA in logical vectors
+
+
+def get_names(obj):
+    """Return names of R object as list of strings (or None if there are none)."""
+    try:
+        names = obj.do_slot("names")
+    except LookupError:
+        return None
+    return list(names)
+
+
+def convert_atomic_vector(obj):
+    """Convert atomic R vector to NumPy array in bulk.
+
+    Numeric and integer vectors are read-only zero-copy views of R's memory
+    (the array keeps a reference to the R object alive),
+    logical vectors require a single copy.
+    Vectors with missing values become pandas' masked arrays.
+    Named vectors are returned as pandas Series.
+    """
+    if obj.typeof == ri.RTYPES.REALSXP:
+        values = np.asarray(obj)
+        # writing to the view would modify the (possibly shared) R object
+        values.flags.writeable = False
+    elif obj.typeof == ri.RTYPES.INTSXP:
+        values = np.asarray(obj)
+        values.flags.writeable = False
+
+        mask = values == NA_INTEGER
+        if mask.any():
+            values = pd.arrays.IntegerArray(values.copy(), mask)
+    elif obj.typeof == ri.RTYPES.LGLSXP:
+        raw = np.asarray(obj)
+        values = raw.astype(bool)
+
+        mask = raw == NA_INTEGER
+        if mask.any():
+            values = pd.arrays.BooleanArray(values, mask)
+    elif obj.typeof == ri.RTYPES.STRSXP:
+        values = np.array(
+            [None if x is ri.NA_Character else x for x in obj], dtype=object
+        )
+    else:
+        raise TypeError(f"Not an atomic vector: {obj.typeof}")
+
+    names = get_names(obj)
+    if names is not None:
+        return pd.Series(values, index=names)
+    return values
+
+
+def convert_list(obj):
+    """Convert (nested) plain R list iteratively.
+
+    Nested plain lists are handled with an explicit stack instead of recursion,
+    all other elements (e.g. atomic vectors) are converted in bulk by the respective converters.
+    Named lists become dicts, unnamed ones lists.
+    """
+    # lists created by the same R code often share their names vector
+    names_cache = {}
+
+    def get_keys(robj):
+        try:
+            names = robj.do_slot("names")
+        except LookupError:
+            return None
+
+        try:
+            return names_cache[names.rid]
+        except KeyError:
+            keys = names_cache[names.rid] = list(names)
+            return keys
+
+    root = [None]
+    stack = [(obj, root, 0)]
+    pending = []
+
+    while stack:
+        robj, parent, index = stack.pop()
+
+        children = ri.ListSexpVector(robj)
+        values = [None] * len(children)
+        pending.append((values, get_keys(robj), parent, index))
+
+        for i, child in enumerate(children):
+            if child.typeof == ri.RTYPES.VECSXP and tuple(child.rclass) == ("list",):
+                stack.append((child, values, i))
+            else:
+                values[i] = converter.rpy2py(child)
+
+    # children were discovered after their parents
+    for values, keys, parent, index in reversed(pending):
+        parent[index] = values if keys is None else dict(zip(keys, values))
+
+    return root[0]
+
+
+def factor_from_codes(raw, levels, ordered=False):
+    """Create pandas Categorical from (1-based) R factor codes."""
+    codes = np.where(raw == NA_INTEGER, -1, raw - 1)
+    return pd.Categorical.from_codes(codes, categories=levels, ordered=ordered)
+
+
+def convert_factor(obj):
+    """Convert R factor to pandas Categorical using only its codes and levels.
+
+    Named factors are returned as pandas Series.
+    """
+    cat = factor_from_codes(
+        np.asarray(obj), list(obj.do_slot("levels")), "ordered" in obj.rclass
+    )
+
+    names = get_names(obj)
+    if names is not None:
+        return pd.Series(cat, index=names)
+    return cat
+
+
+def integer_array(values):
+    return pd.arrays.IntegerArray(values, values == NA_INTEGER)
+
+
+def boolean_array(raw):
+    return pd.arrays.BooleanArray(raw.astype(bool), raw == NA_INTEGER)
+
+
+def dates_array(values):
+    return offsets_to_dates(time_offsets(values)).array
+
+
+def datetimes_array(values, tz):
+    return offsets_to_datetimes(time_offsets(values), tz).array
+
+
+def _identity(values):
+    return values
+
+
+class ColumnParts(NamedTuple):
+    """Values of data.frame column extracted from R and function which assembles the final array."""
+
+    assemble: Callable
+    args: tuple
+
+
+def split_column(obj, copy=False):
+    """Split conversion of data.frame column into the part which accesses R and the rest.
+
+    With `copy`, the extracted values do not reference R memory,
+    so that the column can be assembled in a different thread.
+    """
+    rclass = set(obj.rclass)
+    as_array = np.array if copy else np.asarray
+
+    if "factor" in rclass:
+        return ColumnParts(
+            factor_from_codes,
+            (as_array(obj), list(obj.do_slot("levels")), "ordered" in rclass),
+        )
+    elif rclass <= {"numeric", "integer", "character", "logical"}:
+        if obj.typeof == ri.RTYPES.REALSXP:
+            return ColumnParts(_identity, (np.array(obj, dtype=np.float64),))
+        elif obj.typeof == ri.RTYPES.INTSXP:
+            return ColumnParts(integer_array, (np.array(obj, dtype=np.int32),))
+        elif obj.typeof == ri.RTYPES.LGLSXP:
+            return ColumnParts(boolean_array, (as_array(obj),))
+        elif obj.typeof == ri.RTYPES.STRSXP:
+            values = [None if x is ri.NA_Character else x for x in obj]
+            return ColumnParts(_identity, (np.array(values, dtype=object),))
+    elif "Date" in rclass:
+        # same dtype as the Arrow transfer, independent of `VECTOR_MODE`
+        return ColumnParts(dates_array, (as_array(obj),))
+    elif "POSIXct" in rclass:
+        return ColumnParts(datetimes_array, (as_array(obj), get_tzone(obj)))
+
+    # other classes (e.g. list columns) use the generic converters
+    values = converter.rpy2py(obj)
+
+    if isinstance(values, pd.Series):
+        # index would be misaligned with the dataframe
+        values = values.array
+
+    if copy and isinstance(values, (np.ndarray, pd.api.extensions.ExtensionArray)):
+        # e.g. views of R vectors in numpy `VECTOR_MODE`
+        values = values.copy()
+
+    # columns of single-row dataframes could be converted to scalars
+    if len(obj) == 1 and (
+        not pd.api.types.is_list_like(values) or isinstance(values, dict)
+    ):
+        values = [values]
+
+    return ColumnParts(_identity, (values,))
+
+
+def convert_column(obj):
+    """Convert data.frame column to NumPy/pandas array with at most one copy."""
+    parts = split_column(obj)
+    return parts.assemble(*parts.args)
+
+
+def use_arrow(nrow):
+    """Check whether data.frame with `nrow` rows should be transferred via Arrow."""
+    if ARROW_MODE != "auto" or nrow < ARROW_MIN_ROWS:
+        return False
+
+    # `from . import arrow_bridge` would first look up an R package `arrow.bridge` via `rwrap.__getattr__`
+    from .arrow_bridge import is_available
+
+    return is_available()
+
+
+def convert_dataframe(obj, arrow=None):
+    """Convert R data.frame column-wise to pandas DataFrame.
+
+    Each column is mapped directly to a matching NumPy/pandas dtype:
+    doubles to float64, integers to Int32, logicals to boolean,
+    characters to object, factors to Categorical and dates to datetime64.
+    Large data.frames are transferred via Arrow if available
+    (`arrow=None`, otherwise the transfer is forced/disabled), which yields the same dtypes.
+    """
+    if arrow is None:
+        arrow = use_arrow(ri.baseenv["nrow"](obj)[0])
+
+    if arrow:
+        from .arrow_bridge import rdataframe_to_pandas
+
+        df = rdataframe_to_pandas(obj)
+        if df is not None:
+            return df
+
+    return assemble_dataframe(*extract_dataframe_columns(obj))
+
+
+def extract_dataframe_columns(obj, copy=False):
+    """Extract columns and row names of R data.frame (the part of the conversion which accesses R).
+
+    With `copy`, the result does not reference R memory, see `split_column`.
+    """
+    data = {
+        name: split_column(column, copy=copy)
+        for name, column in zip(get_names(obj) or [], ri.ListSexpVector(obj))
+    }
+    index = list(ri.baseenv["rownames"](obj))
+    return data, index
+
+
+def assemble_dataframe(data, index):
+    """Create DataFrame from extracted columns without accessing R."""
+    columns = {name: parts.assemble(*parts.args) for name, parts in data.items()}
+
+    # columns are already fresh arrays, do not let pandas copy them again
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def convert_matrix(obj, copy=None):
+    """Convert matrix to NumPy array (dimnames are dropped).
+
+    Large numeric matrices are not copied but returned as read-only views,
+    which keep the R object alive. `copy` forces (or prevents) a copy regardless of the size.
+    """
+    if copy is None:
+        copy = len(obj) < LARGE_MATRIX_SIZE
+
+    if not copy and obj.typeof in (
+        ri.RTYPES.REALSXP,
+        ri.RTYPES.INTSXP,
+    ):
+        values = np.asarray(obj)
+        values.flags.writeable = False
+        return values
+
+    return np.array(obj)
+
+
+def time_offsets(obj):
+    """Return numeric offsets of Date/POSIXct vector (or its values) with missing values as NaN.
+
+    Besides doubles, such vectors can also be stored as integers (e.g. `data.table::IDate`).
+    """
+    values = np.asarray(obj)
+    if values.dtype == np.int32:
+        values = np.where(values == NA_INTEGER, np.nan, values)
+    return values
+
+
+def offsets_to_dates(offsets):
+    """Convert days since epoch to DatetimeIndex."""
+    return pd.to_datetime(offsets, unit="D")
+
+
+def offsets_to_datetimes(offsets, tz=""):
+    """Convert seconds since epoch to UTC DatetimeIndex (converted to `tz` if given)."""
+    times = pd.to_datetime(offsets, unit="s", utc=True)
+    if tz:
+        times = times.tz_convert(tz)
+    return times
+
+
+def get_tzone(obj):
+    """Return time zone of POSIXct vector ("" if not set)."""
+    try:
+        return obj.do_slot("tzone")[0]
+    except LookupError:
+        return ""
+
+
 def convert_dates(obj):
-    days2date = lambda days_since_epoch: datetime.datetime.fromtimestamp(
-        days_since_epoch * 24 * 60 * 60
-    ).replace(hour=0, minute=0, second=0)
-    return [days2date(days_since_epoch) for days_since_epoch in obj]
+    """Convert Date vector (days since epoch) in bulk."""
+    dates = offsets_to_dates(time_offsets(obj))
+
+    if VECTOR_MODE == "numpy":
+        return dates
+    return dates.to_pydatetime().tolist()
+
+
+def convert_datetimes(obj):
+    """Convert POSIXct vector (seconds since epoch) in bulk and keep its time zone."""
+    times = offsets_to_datetimes(time_offsets(obj), get_tzone(obj))
+
+    if VECTOR_MODE == "numpy":
+        return times
+    return times.to_pydatetime().tolist()
 
 
 def convert_geometry(obj):
-    """Convert an sfg (simple feature geometry) object.
+    """Convert an sfg (simple feature geometry) object of any type and dimension.
+
+    The geometry is encoded as WKB by sf and decoded by shapely
+    (M coordinates require shapely>=2.1 with GEOS>=3.12).
+    """
+    from shapely import wkb
+
+    wkb_hex = rcall(rfunc_cached("function(x) sf::st_as_binary(x, hex = TRUE)"), obj)
+    return wkb.loads(wkb_hex[0], hex=True)
 
-    Can have one of these dimensionalities:
-    * 2D: single point
-    * 3D: set of points (each row containing one point)
-    * 4D: list
 
-    Polygons consist of a hull (set of points) and optionally a set of holes (each hole is yet again a set of points)
+def convert_sfc(obj):
+    """Convert an sfc (simple feature geometry list column) object.
 
-    More details: https://r-spatial.github.io/sf/articles/sf1.html#how-simple-features-in-r-are-organized-1
+    All geometries are encoded as WKB by sf in a single call
+    and decoded in bulk by geopandas. The CRS is preserved.
     """
-    # determine object properties
-    rlcass = list(obj.rclass)
-    assert len(rlcass) == 3, rlcass
-    assert rlcass[-1] == "sfg", rlcass
-
-    dimension = rlcass[0]
-    type_ = rlcass[1]
-
-    assert dimension == "XY", "Other dimensions not yet implemented"
-
-    # convert object
-    if type_ == "POINT":
-        return geometry.Point(obj)
-    elif type_ == "POLYGON":
-        hole_list = []
-        if obj.typeof == ri.RTYPES.VECSXP:
-            hull = np.asarray(obj[0])
-
-            if len(obj) > 1:
-                for o in obj[1:]:
-                    hole_list.append(np.asarray(o))
-        elif obj.typeof == ri.RTYPES.REALSXP:
-            hull = np.asarray(obj)
-
-        return geometry.Polygon(hull, hole_list)
-    elif type_ == "MULTIPOLYGON":
-        poly_list = []
-        for entry in obj:
-            # entry class is `list` otherwise
-            entry.rclass = ri.StrSexpVector([dimension, "POLYGON", "sfg"])
-
-            p = convert_geometry(entry)
-            poly_list.append(p)
-
-        return geometry.MultiPolygon(poly_list)
-    else:
-        raise TypeError(f"Invalid geometry type: {type_}")
+    wkb_hex, crs = rcall(
+        rfunc_cached(
+            "function(x) list(sf::st_as_binary(x, hex = TRUE), sf::st_crs(x)$wkt)"
+        ),
+        obj,
+    )
+
+    import geopandas as gpd
+
+    crs = crs[0]
+    if crs is ri.NA_Character:
+        crs = None
+
+    return gpd.GeoSeries.from_wkb(list(wkb_hex), crs=crs)
+
+
+def convert_sf(obj):
+    """Convert an sf object (data.frame with geometry column)."""
+    import geopandas as gpd
+
+    df = convert_dataframe(obj)
+    df.index = pd.RangeIndex(len(df))
+
+    return gpd.GeoDataFrame(df, geometry=obj.do_slot("sf_column")[0])
+
+
+def convert_igraph_attribute(values):
+    """Convert vertex/edge attribute to list with one entry per vertex/edge."""
+    res = converter.rpy2py(values)
+
+    if values.typeof in ATOMIC_TYPES and not pd.api.types.is_list_like(res):
+        # atomic vectors of length 1 are converted to scalars
+        return [res]
+    elif isinstance(res, dict):
+        return list(res.values())
+    return list(res)
 
 
 def convert_igraph(obj):
-    # TODO: do not write to disk
+    """Convert igraph object by transferring its edge list and attributes in bulk."""
+    import igraph
+
     igraph_R = importr_cached("igraph")
 
-    with tempfile.NamedTemporaryFile() as fd:
-        igraph_R.write_graph(obj, fd.name, format="graphml")
-        graph = igraph.Graph.Read(fd.name, format="graphml")
-    return graph
+    edges = np.asarray(
+        rcall(igraph_R.as_edgelist, obj, names=ri.BoolSexpVector([False]))
+    )
+    edges = (edges.astype(np.int64) - 1).tolist()
 
+    return igraph.Graph(
+        n=int(rcall(igraph_R.vcount, obj)[0]),
+        edges=edges,
+        directed=rcall(igraph_R.is_directed, obj)[0],
+        graph_attrs={
+            name: converter.rpy2py(
+                rcall(igraph_R.graph_attr, obj, ri.StrSexpVector([name]))
+            )
+            for name in rcall(igraph_R.graph_attr_names, obj)
+        },
+        vertex_attrs={
+            name: convert_igraph_attribute(
+                rcall(igraph_R.vertex_attr, obj, ri.StrSexpVector([name]))
+            )
+            for name in rcall(igraph_R.vertex_attr_names, obj)
+        },
+        edge_attrs={
+            name: convert_igraph_attribute(
+                rcall(igraph_R.edge_attr, obj, ri.StrSexpVector([name]))
+            )
+            for name in rcall(igraph_R.edge_attr_names, obj)
+        },
+    )
+
+
+def convert_dimnames(obj):
+    """Return row and column names (or `None`s) of R matrix-like object."""
+    return [None if n is ri.NULL else list(n) for n in obj]
+
+
+def convert_sparse_matrix(obj):
+    """Convert sparse matrix of the Matrix package by copying its slots in bulk.
+
+    Compressed column, compressed row and triplet matrices (e.g. dgCMatrix, dgRMatrix
+    and dgTMatrix or subclasses thereof) become csc, csr and coo matrices respectively.
+    Like for dense matrices, dimnames are dropped.
+    """
+    import scipy.sparse
+
+    # subclasses resolve to this converter as well, so check the storage format
+    storage = rcall(
+        rfunc_cached(
+            """
+            function(x) {
+                if (methods::is(x, "CsparseMatrix")) "C"
+                else if (methods::is(x, "RsparseMatrix")) "R"
+                else if (methods::is(x, "TsparseMatrix")) "T"
+                else NA_character_
+            }
+            """
+        ),
+        obj,
+    )[0]
+
+    shape = tuple(np.array(obj.do_slot("Dim"), dtype=np.int64))
+    data = np.array(obj.do_slot("x"), dtype=np.float64)
+
+    if storage == "C":
+        indices = np.array(obj.do_slot("i"), dtype=np.int32)
+        indptr = np.array(obj.do_slot("p"), dtype=np.int32)
+        return scipy.sparse.csc_matrix((data, indices, indptr), shape=shape)
+    elif storage == "R":
+        indices = np.array(obj.do_slot("j"), dtype=np.int32)
+        indptr = np.array(obj.do_slot("p"), dtype=np.int32)
+        return scipy.sparse.csr_matrix((data, indices, indptr), shape=shape)
+    elif storage == "T":
+        row = np.array(obj.do_slot("i"), dtype=np.int32)
+        col = np.array(obj.do_slot("j"), dtype=np.int32)
+        return scipy.sparse.coo_matrix((data, (row, col)), shape=shape)
+
+    raise TypeError(f"Unsupported sparse matrix class: {list(obj.rclass)}")
+
+
+# converters for specific R classes
+class ClassConverterRegistry:
+    """Registry of converters for specific R classes.
+
+    If several registered classes match an R object,
+    the converter with the highest priority is used.
+    Ties are resolved by the order of the object's class vector
+    (most specific class first).
+    S4 objects also match converters registered for their superclasses.
+    Resolved converters are cached per class vector.
+    """
+
+    def __init__(self) -> None:
+        self._converters = {}  # class name -> (priority, converter)
+        self._cache = {}  # class vector -> converter
+
+    def register(self, class_name, func=None, priority=0):
+        """Register converter for R class, can also be used as a decorator."""
+        if func is None:
+            return lambda func: self.register(class_name, func, priority=priority)
+
+        self._converters[class_name] = (priority, func)
+        self._cache.clear()
+        return func
+
+    def unregister(self, class_name):
+        """Remove converter for R class."""
+        del self._converters[class_name]
+        self._cache.clear()
+
+    def resolve(self, obj, rclass=None):
+        """Return converter for R object (or None if no converter is registered)."""
+        if rclass is None:
+            rclass = tuple(obj.rclass)
+
+        try:
+            return self._cache[rclass]
+        except KeyError:
+            pass
+
+        classes = rclass
+        if obj.typeof == ri.RTYPES.S4SXP:
+            # includes superclasses
+            classes = tuple(rcall(rfunc_cached("methods::is"), obj))
+
+        func = None
+        best_priority = None
+        for class_ in classes:
+            if class_ in self._converters:
+                priority, candidate = self._converters[class_]
+                if best_priority is None or priority > best_priority:
+                    func, best_priority = candidate, priority
+
+        self._cache[rclass] = func
+        return func
 
-# TODO: make use of `NameClassMap`
-CLASS_CONVERTERS = {
-    "Date": convert_dates,
-    "sf": lambda obj: gpd.GeoDataFrame(
-        pd.DataFrame(
-            {column: converter.rpy2py(data) for column, data in zip(obj.names, obj)}
-        )
-    ),
-    "sfc": lambda obj: gpd.GeoSeries([convert_geometry(o) for o in obj]),
-    "POINT": lambda obj: [convert_geometry(obj)],
-    "POLYGON": lambda obj: [convert_geometry(obj)],
-    "MULTIPOLYGON": lambda obj: [convert_geometry(obj)],
-    "igraph": convert_igraph,
-    "data.frame": lambda obj: converter.rpy2py(ro.DataFrame(obj)),
-    "matrix": lambda obj: np.array(obj),
-}
 
+CLASS_CONVERTERS = ClassConverterRegistry()
+register_class_converter = CLASS_CONVERTERS.register
 
-@converter.py2rpy.register(datetime.datetime)
+register_class_converter("Date", convert_dates)
+register_class_converter("POSIXct", convert_datetimes)
+register_class_converter("sf", convert_sf)
+register_class_converter("sfc", convert_sfc)
+register_class_converter("sfg", lambda obj: [convert_geometry(obj)])
+register_class_converter("igraph", convert_igraph)
+register_class_converter("data.frame", convert_dataframe)
+register_class_converter("factor", convert_factor)
+register_class_converter("matrix", convert_matrix)
+register_class_converter("dgCMatrix", convert_sparse_matrix)
+register_class_converter("dgRMatrix", convert_sparse_matrix)
+register_class_converter("dgTMatrix", convert_sparse_matrix)
+
+
+# dates/times
+def datetimes_to_vector(values, tz=None):
+    """Create R vector from datetime64 array in one shot.
+
+    Arrays with day precision become Date vectors, all others POSIXct vectors.
+    """
+    unit, _ = np.datetime_data(values.dtype)
+
+    if unit == "D":
+        res = values.astype(np.int64).astype(np.float64)  # days since epoch
+        classes = ["Date"]
+    else:
+        res = values.astype("datetime64[ns]").astype(np.int64) / 1e9
+        classes = ["POSIXct", "POSIXt"]
+    res[np.isnat(values)] = np.nan
+
+    res = array_to_vector(res)
+    res.rclass = ri.StrSexpVector(classes)
+    if unit != "D":
+        res.do_slot_assign("tzone", ri.StrSexpVector([tz or "UTC"]))
+    return res
+
+
+def pandas_datetimes_to_vector(obj):
+    """Create POSIXct vector from pandas datetime Series/Index in one shot."""
+    tz = obj.dt.tz if isinstance(obj, pd.Series) else obj.tz
+
+    # time zone aware values are converted to UTC
+    values = obj.to_numpy(dtype="datetime64[ns]")
+    return datetimes_to_vector(values, None if tz is None else str(tz))
+
+
+@converter.py2rpy.register(datetime.date)
 def _(obj):
-    logger.trace(f"py2rpy::datetime.datetime")
+    return datetimes_to_vector(np.array([obj], dtype="datetime64[D]"))
 
-    return ro.r(
-        f"lubridate::make_date(year={obj.year}, month={obj.month}, day={obj.day})"
-    )
+
+@converter.py2rpy.register(pd.DatetimeIndex)
+def _(obj):
+    return pandas_datetimes_to_vector(obj)
 
 
 # vectors
+INT32_MIN, INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def array_to_vector(arr):
+    """Copy 1D NumPy array into new R vector in one bulk operation.
+
+    Integer arrays whose values do not fit into R's 32 bit integers become double vectors.
+    """
+    kind = arr.dtype.kind
+
+    if kind in "iu":
+        if arr.size == 0 or (arr.min() > INT32_MIN and arr.max() <= INT32_MAX):
+            arr = np.ascontiguousarray(arr, dtype=np.int32)
+            return ro.IntVector(ri.IntSexpVector.from_memoryview(memoryview(arr)))
+        kind = "f"
+
+    if kind == "f":
+        arr = np.ascontiguousarray(arr, dtype=np.float64)
+        return ro.FloatVector(ri.FloatSexpVector.from_memoryview(memoryview(arr)))
+    elif kind == "b":
+        # R stores logicals as 32 bit integers
+        arr = np.ascontiguousarray(arr, dtype=np.int32)
+        return ro.BoolVector(ri.BoolSexpVector.from_memoryview(memoryview(arr)))
+
+    raise TypeError(f"No bulk conversion implemented for dtype {arr.dtype}")
+
+
+def array_to_matrix(arr):
+    """Write 2D NumPy array into newly allocated R matrix with a single copy.
+
+    Memory-mapped arrays are streamed from disk without loading them into memory first.
+    """
+    kind = arr.dtype.kind
+
+    if kind in "iu":
+        if arr.size == 0 or (arr.min() > INT32_MIN and arr.max() <= INT32_MAX):
+            mode = "integer"
+        else:
+            mode = "double"
+    elif kind == "f":
+        mode = "double"
+    elif kind == "b":
+        mode = "logical"
+    else:
+        raise TypeError(f"No bulk conversion implemented for dtype {arr.dtype}")
+
+    res = ri.baseenv["vector"](ri.StrSexpVector([mode]), ri.FloatSexpVector([arr.size]))
+    res.do_slot_assign("dim", ri.IntSexpVector(arr.shape))
+
+    # column-major view of R's memory
+    np.asarray(res)[...] = arr
+    return res
+
+
+def needs_rlist(obj):
+    """Check whether Python list has to become an R list instead of an atomic vector."""
+    types = {type(e) for e in obj}
+    return len(types) != 1 or issubclass(next(iter(types)), (dict, list, tuple))
+
+
+def nested_to_list(obj):
+    """Convert (nested) dict or list to R list iteratively.
+
+    Nested dicts and lists are handled with an explicit stack instead of recursion,
+    all other elements (e.g. homogeneous lists) are converted in bulk by the respective converters.
+    """
+    root = [None]
+    stack = [(obj, root, 0)]
+    pending = []
+
+    while stack:
+        item, parent, index = stack.pop()
+
+        if isinstance(item, dict):
+            names = [str(k) for k in item.keys()]
+            children = item.values()
+        else:
+            names = [str(i + 1) for i in range(len(item))]
+            children = item
+
+        values = [None] * len(names)
+        pending.append((values, names, parent, index))
+
+        for i, child in enumerate(children):
+            if type(child) is dict or (
+                type(child) in (list, tuple) and needs_rlist(child)
+            ):
+                stack.append((child, values, i))
+            else:
+                values[i] = converter.py2rpy(child)
+
+    # children were discovered after their parents
+    for values, names, parent, index in reversed(pending):
+        res = ri.ListSexpVector(values)
+        res.do_slot_assign("names", ri.StrSexpVector(names))
+        parent[index] = res
+
+    return ro.ListVector(root[0])
+
+
 @converter.py2rpy.register(list)
 @converter.py2rpy.register(tuple)
 def _(obj):
-    logger.trace("py2rpy::list")
-
-    if len({type(e) for e in obj}) == 1:
-        # has no mixed types
+    if not needs_rlist(obj):
+        # has no mixed types, convert in bulk
+        first = obj[0]
 
-        vector_type_map = {
-            bool: ro.BoolVector,
-            int: ro.IntVector,
-            float: ro.FloatVector,
-            str: ro.StrVector,
-        }
-
-        for type_, VectorClass in vector_type_map.items():
-            if isinstance(obj[0], type_):
-                return VectorClass([converter.py2rpy(x) for x in obj])
+        if isinstance(first, datetime.date):
+            # datetimes are converted to dates (like single values)
+            return datetimes_to_vector(np.array(obj, dtype="datetime64[D]"))
+        elif isinstance(first, bool):
+            return array_to_vector(np.fromiter(obj, dtype=bool, count=len(obj)))
+        elif isinstance(first, int):
+            try:
+                arr = np.fromiter(obj, dtype=np.int64, count=len(obj))
+            except OverflowError:
+                return ro.FloatVector(obj)
+            return array_to_vector(arr)
+        elif isinstance(first, float):
+            return array_to_vector(np.fromiter(obj, dtype=np.float64, count=len(obj)))
+        elif isinstance(first, str):
+            return ro.StrVector(obj)
 
         raise NotImplementedError(
             f"No list conversion implemented for type {type(obj[0])}"
         )
 
-    # heterogeneous types, use R list
-    return ro.ListVector({i + 1: converter.py2rpy(v) for i, v in enumerate(obj)})
+    # heterogeneous types or nested containers, use R list
+    return nested_to_list(obj)
+
+
+# factors
+def categorical_to_factor(cat):
+    """Create R factor from pandas Categorical using only its codes and categories."""
+    codes = cat.codes.astype(np.int32) + 1
+    codes[codes == 0] = NA_INTEGER
+
+    res = ri.IntSexpVector.from_memoryview(memoryview(codes))
+    res.do_slot_assign("levels", ri.StrSexpVector(cat.categories.astype(str)))
+    res.do_slot_assign(
+        "class", ri.StrSexpVector(["ordered", "factor"] if cat.ordered else ["factor"])
+    )
+    return ro.FactorVector(res)
+
+
+@converter.py2rpy.register(pd.Categorical)
+def _(obj):
+    return categorical_to_factor(obj)
+
+
+# buffers
+_numpy_py2rpy = converter.py2rpy.dispatch(np.ndarray)
+_pandas_series_py2rpy = converter.py2rpy.dispatch(pd.Series)
+
+
+# NumPy dtypes of numeric `array.array` typecodes (both use the C types)
+ARRAY_TYPECODES = {
+    "b": np.byte,
+    "B": np.ubyte,
+    "h": np.short,
+    "H": np.ushort,
+    "i": np.intc,
+    "I": np.uintc,
+    "l": np.dtype("l"),
+    "L": np.dtype("L"),
+    "q": np.longlong,
+    "Q": np.ulonglong,
+    "f": np.single,
+    "d": np.double,
+}
+
+
+@converter.py2rpy.register(array.array)
+def _(obj):
+    dtype = ARRAY_TYPECODES.get(obj.typecode)
+    if dtype is None:
+        # e.g. unicode characters
+        return converter.py2rpy(obj.tolist())
+    return array_to_vector(np.frombuffer(obj, dtype=dtype))
+
+
+@converter.py2rpy.register(np.ndarray)
+def _(obj):
+    if obj.ndim == 1 and obj.dtype.kind in "biuf":
+        return array_to_vector(obj)
+    elif obj.ndim == 1 and obj.dtype.kind == "M":
+        return datetimes_to_vector(obj)
+    elif obj.ndim == 2 and obj.dtype.kind in "biuf" and obj.size >= LARGE_MATRIX_SIZE:
+        return array_to_matrix(obj)
+    return _numpy_py2rpy(obj)
+
+
+@converter.py2rpy.register(pd.Series)
+def _(obj):
+    if register_optional_py2rpy(obj):
+        return converter.py2rpy(obj)
+
+    if pd.api.types.is_datetime64_any_dtype(obj.dtype):
+        res = pandas_datetimes_to_vector(obj)
+    elif isinstance(obj.dtype, pd.CategoricalDtype):
+        res = categorical_to_factor(obj.array)
+    elif isinstance(obj.dtype, np.dtype) and obj.dtype.kind in "biuf":
+        res = array_to_vector(obj.to_numpy())
+    else:
+        # e.g. strings or nullable extension types
+        return _pandas_series_py2rpy(obj)
+
+    res.do_slot_assign("names", ri.StrSexpVector(obj.index.astype(str)))
+    return res
 
 
 @converter.rpy2py.register(ro.Vector)
@@ -189,44 +903,45 @@ def _(obj):
 @converter.rpy2py.register(ri.StrSexpVector)
 @converter.rpy2py.register(ri.ListSexpVector)
 def _(obj):
-    logger.trace(f"rpy2py::ro.Vector[{list(obj.rclass)}]")
-    rclass = set(obj.rclass)
+    rclass = tuple(obj.rclass)
     is_atomic = True
 
     # handle special classes
-    for class_, conv_func in CLASS_CONVERTERS.items():
-        if class_ in rclass:
-            logger.trace(f"Using custom class converter for {class_}")
-            obj = conv_func(obj)
-            break
-    else:
+    conv_func = CLASS_CONVERTERS.resolve(obj, rclass)
+    if conv_func is not None:
+        obj = conv_func(obj)
+    elif rclass == ("list",):
+        return convert_list(obj)
+    elif {"numeric", "integer", "character", "logical", "list"}.intersection(rclass):
         # if not special class was detected, we try primitives
-        if {"numeric", "integer", "character", "logical", "list"} & rclass:
-            logger.trace("Using default class converter")
+        if (
+            VECTOR_MODE == "numpy"
+            and obj.typeof in ATOMIC_TYPES
+            and len(obj) != 1  # scalars are always converted to Python types
+        ):
+            return convert_atomic_vector(obj)
 
-            keys = converter.rpy2py(obj.names)
-            values = [converter.rpy2py(x) for x in obj]
+        keys = converter.rpy2py(obj.names)
+        values = [converter.rpy2py(x) for x in obj]
 
-            if keys is not None:
-                # could accidentally be atomic
-                if not isinstance(keys, list):
-                    keys = [keys]
+        if keys is not None:
+            # could accidentally be atomic
+            if not isinstance(keys, list):
+                keys = [keys]
 
-                obj = dict(zip(keys, values))
-            else:
-                obj = values
-
-            if "list" in rclass:
-                is_atomic = False
+            obj = dict(zip(keys, values))
         else:
-            # if no converter was found, we just return the raw object
-            logger.trace(f"Skipping conversion for class {rclass}")
+            obj = values
+
+        if "list" in rclass:
+            is_atomic = False
+    # if no converter was found, we just return the raw object
 
     # vector of length 1 in R should be atomic type in Python
     if (
         not isinstance(obj, dict)
         and not isinstance(obj, pd.DataFrame)
-        and not isinstance(obj, igraph.Graph)
+        and isinstance(obj, collections.abc.Sized)
         and len(obj) == 1
         and is_atomic
     ):
@@ -234,32 +949,261 @@ def _(obj):
     return obj
 
 
+# S4 objects
+_s4_rpy2py = converter.rpy2py.dispatch(ri.SexpS4)
+
+
+@converter.rpy2py.register(ri.SexpS4)
+def _(obj):
+    conv_func = CLASS_CONVERTERS.resolve(obj)
+    if conv_func is None:
+        return _s4_rpy2py(obj)
+    return conv_func(obj)
+
+
 # dicts
 @converter.py2rpy.register(dict)
 def _(obj):
-    logger.trace("py2rpy::dict")
-
-    return ro.ListVector({k: converter.py2rpy(v) for k, v in obj.items()})
+    return nested_to_list(obj)
 
 
 # dataframes
-# (fix for "ValueError: If using all scalar values, you must pass an index")
 @converter.rpy2py.register(ro.DataFrame)
 def _(obj):
-    items = collections.OrderedDict(
-        (k, converter.rpy2py(v) if isinstance(v, ri.Sexp) else v)
-        for k, v in obj.items()
+    return convert_dataframe(obj)
+
+
+# geometries
+def wkb_to_sfc(wkb_hex, crs):
+    """Create sfc from hex-encoded WKB geometries in a single R call."""
+    return rcall(
+        rfunc_cached(
+            """
+            function(wkb, crs) {
+                crs <- if (is.na(crs)) sf::NA_crs_ else sf::st_crs(crs)
+                sf::st_as_sfc(structure(as.list(wkb), class = "WKB"), crs = crs)
+            }
+            """
+        ),
+        ri.StrSexpVector(wkb_hex),
+        ri.StrSexpVector([ri.NA_Character if crs is None else crs.to_wkt()]),
     )
 
-    # if there is a single row in the dataframe, conversion will fail
-    # because we need lists and not scalars
-    index = converter.rpy2py(obj.rownames)
-    if not isinstance(index, list):
-        index = [index]
 
-        for key in items:
-            items[key] = [items[key]]
+def geometry_to_sfg(obj):
+    """Convert shapely geometry to sfg."""
+    from shapely import wkb
 
-    res = pd.DataFrame.from_dict(items)
-    res.index = index
-    return res
+    sfc = wkb_to_sfc([wkb.dumps(obj, hex=True)], None)
+    return sfc[0]
+
+
+def geoseries_to_sfc(obj):
+    """Convert GeoSeries to sfc using one bulk WKB encoding."""
+    return wkb_to_sfc(obj.to_wkb(hex=True).tolist(), obj.crs)
+
+
+def geodataframe_to_sf(obj):
+    """Convert GeoDataFrame to sf object."""
+    geometry_name = obj.geometry.name
+
+    return rcall(
+        rfunc_cached(
+            """
+            function(df, geometry, name) {
+                if (ncol(df) == 0) df <- data.frame(row.names = seq_along(geometry))
+                df[[name]] <- geometry
+                sf::st_sf(df, sf_column_name = name)
+            }
+            """
+        ),
+        converter.py2rpy(pd.DataFrame(obj.drop(columns=geometry_name))),
+        converter.py2rpy(obj.geometry),
+        ri.StrSexpVector([geometry_name]),
+    )
+
+
+# networks
+def graph_to_igraph(obj):
+    """Convert igraph.Graph by transferring its edge list and attributes in bulk."""
+    igraph_R = importr_cached("igraph")
+
+    edges = np.asarray(obj.get_edgelist(), dtype=np.int32).reshape(-1) + 1
+
+    graph = rcall(
+        igraph_R.make_empty_graph,
+        n=ri.IntSexpVector([0]),
+        directed=ri.BoolSexpVector([obj.is_directed()]),
+    )
+    graph = rcall(
+        igraph_R.add_vertices,
+        graph,
+        ri.IntSexpVector([obj.vcount()]),
+        attr=converter.py2rpy({name: obj.vs[name] for name in obj.vs.attributes()}),
+    )
+    graph = rcall(
+        igraph_R.add_edges,
+        graph,
+        array_to_vector(edges),
+        attr=converter.py2rpy({name: obj.es[name] for name in obj.es.attributes()}),
+    )
+
+    for name in obj.attributes():
+        graph = rcall(
+            igraph_R.set_graph_attr,
+            graph,
+            ri.StrSexpVector([name]),
+            converter.py2rpy(obj[name]),
+        )
+
+    return graph
+
+
+# sparse matrices
+def sparse_to_matrix(mat, dimnames=None):
+    """Create sparse matrix of the Matrix package from scipy.sparse matrix in bulk.
+
+    csr and coo matrices become dgRMatrix and dgTMatrix, all others dgCMatrix.
+    `dimnames` are row and column names (or `None`s).
+    """
+    if dimnames is None:
+        dimnames = (None, None)
+
+    if mat.format == "csr":
+        rclass = "dgRMatrix"
+    elif mat.format == "coo":
+        rclass = "dgTMatrix"
+    else:
+        rclass = "dgCMatrix"
+        mat = mat.tocsc()
+
+    if mat.format != "coo" and not mat.has_canonical_format:
+        # Matrix requires sorted indices without duplicates
+        mat = mat.copy()
+        mat.sum_duplicates()
+
+    if rclass == "dgTMatrix":
+        slots = {"i": mat.row, "j": mat.col}
+    else:
+        slots = {"j" if rclass == "dgRMatrix" else "i": mat.indices, "p": mat.indptr}
+
+    return rcall(
+        rfunc_cached(
+            """
+            function(rclass, ...) {
+                loadNamespace("Matrix")
+                methods::new(rclass, ...)
+            }
+            """
+        ),
+        ri.StrSexpVector([rclass]),
+        x=ri.FloatSexpVector.from_memoryview(
+            memoryview(np.ascontiguousarray(mat.data, dtype=np.float64))
+        ),
+        Dim=ri.IntSexpVector(mat.shape),
+        Dimnames=ri.ListSexpVector(
+            [ri.NULL if n is None else ri.StrSexpVector(n) for n in dimnames]
+        ),
+        **{
+            name: ri.IntSexpVector.from_memoryview(
+                memoryview(np.ascontiguousarray(values, dtype=np.int32))
+            )
+            for name, values in slots.items()
+        },
+    )
+
+
+def sparse_dataframe_to_matrix(df):
+    """Convert DataFrame with only sparse columns to dgCMatrix."""
+    return sparse_to_matrix(
+        df.sparse.to_coo().tocsc(),
+        dimnames=(df.index.astype(str), df.columns.astype(str)),
+    )
+
+
+# optional dependencies
+# their py2rpy converters are only registered once an object of the respective module is converted
+def register_shapely():
+    from shapely import geometry
+
+    converter.py2rpy.register(geometry.base.BaseGeometry, geometry_to_sfg)
+
+
+def register_geopandas():
+    import geopandas as gpd
+
+    converter.py2rpy.register(gpd.GeoSeries, geoseries_to_sfc)
+    converter.py2rpy.register(gpd.GeoDataFrame, geodataframe_to_sf)
+
+
+def register_igraph():
+    import igraph
+
+    converter.py2rpy.register(igraph.Graph, graph_to_igraph)
+
+
+def register_scipy():
+    import scipy.sparse
+
+    converter.py2rpy.register(scipy.sparse.spmatrix, sparse_to_matrix)
+    if hasattr(scipy.sparse, "sparray"):
+        converter.py2rpy.register(scipy.sparse.sparray, sparse_to_matrix)
+
+
+# called after converters of optional dependencies were registered
+REGISTRATION_HOOKS = []
+
+OPTIONAL_PY2RPY = {
+    "shapely": register_shapely,
+    "geopandas": register_geopandas,
+    "igraph": register_igraph,
+    "scipy": register_scipy,
+}
+
+
+def register_optional_py2rpy(obj):
+    """Register converters for type of `obj` if it comes from an optional dependency.
+
+    Returns whether new converters were registered.
+    """
+    module = type(obj).__module__.partition(".")[0]
+
+    register = OPTIONAL_PY2RPY.pop(module, None)
+    if register is None:
+        return False
+
+    register()
+    for hook in REGISTRATION_HOOKS:
+        hook()
+    return True
+
+
+_pandas_dataframe_py2rpy = converter.py2rpy.dispatch(pd.DataFrame)
+_object_py2rpy = converter.py2rpy.dispatch(object)
+
+
+@converter.py2rpy.register(pd.DataFrame)
+def _(obj):
+    if register_optional_py2rpy(obj):
+        return converter.py2rpy(obj)
+
+    if len(obj.columns) > 0 and all(
+        isinstance(dtype, pd.SparseDtype) for dtype in obj.dtypes
+    ):
+        return sparse_dataframe_to_matrix(obj)
+
+    if use_arrow(len(obj)):
+        from .arrow_bridge import pandas_to_rdataframe
+
+        res = pandas_to_rdataframe(obj)
+        if res is not None:
+            return ro.DataFrame(res)
+
+    return _pandas_dataframe_py2rpy(obj)
+
+
+@converter.py2rpy.register(object)
+def _(obj):
+    if register_optional_py2rpy(obj):
+        return converter.py2rpy(obj)
+    return _object_py2rpy(obj)
@@ -1,34 +1,189 @@
 """Wrap R package with Python class to facilitate method access."""
 
-from typing import Callable
-
-from loguru import logger
+import time
+from typing import Callable, NamedTuple
 
 import rpy2.robjects as ro
-from rpy2.robjects.packages import importr
+import rpy2.rinterface as ri
 from rpy2.robjects.conversion import localconverter
 
-from .converter import converter, importr_cached
+from . import _executor
+from .converter import (
+    CLASS_CONVERTERS,
+    R_MODULE_DICT,
+    converter,
+    importr_cached,
+    rcall,
+    assemble_dataframe,
+    convert_dataframe,
+    extract_dataframe_columns,
+    use_arrow,
+)
+from ._proxy import RObjectProxy
+from ._profiling import ACTIVE_PROFILERS, CallRecord, add_record, object_size
+
+
+def convert_arguments(args, kwargs, cv, prm_translate):
+    """Convert arguments to R and translate keyword argument names."""
+    args = [a if isinstance(a, ri.Sexp) else cv.py2rpy(a) for a in args]
+    kwargs = {
+        prm_translate.get(k, k): v if isinstance(v, ri.Sexp) else cv.py2rpy(v)
+        for k, v in kwargs.items()
+    }
+    return args, kwargs
+
+
+def call_rfunc(func: ro.functions.Function, args, kwargs, cv, prm_translate=None):
+    """Call R function with converted arguments and return the unconverted result."""
+    if prm_translate is None:
+        prm_translate = getattr(func, "_prm_translate", {})
+
+    args, kwargs = convert_arguments(args, kwargs, cv, prm_translate)
+    return rcall(func, *args, **kwargs)
+
+
+def profiled_call(package, name, func, args, kwargs, cv, prm_translate, convert):
+    """Call R function and return its result and a `CallRecord` with the duration of each step."""
+    start = time.perf_counter()
+    rargs, rkwargs = convert_arguments(args, kwargs, cv, prm_translate)
+    converted = time.perf_counter()
+    res = rcall(func, *rargs, **rkwargs)
+    executed = time.perf_counter()
+    out = convert(res, cv)
+    end = time.perf_counter()
+
+    record = CallRecord(
+        package,
+        # name of the function in R, e.g. `p.adjust` instead of `p_adjust`
+        getattr(func, "__rname__", name),
+        start,
+        converted - start,
+        executed - converted,
+        end - executed,
+        sum(object_size(a) for a in [*rargs, *rkwargs.values()]),
+        object_size(res),
+    )
+    return out, record
+
+
+class DataFrameParts(NamedTuple):
+    """Columns of data.frame which still need to be assembled into a DataFrame."""
+
+    data: dict
+    index: list
+
+
+def convert_partially(res, cv):
+    """Convert result in R thread, but leave assembly of plain data.frames to the caller."""
+    if (
+        isinstance(res, ri.ListSexpVector)
+        and CLASS_CONVERTERS.resolve(res) is convert_dataframe
+        and not use_arrow(ri.baseenv["nrow"](res)[0])
+    ):
+        return DataFrameParts(*extract_dataframe_columns(res, copy=True))
+    return cv.rpy2py(res)
+
+
+def finish_conversion(res):
+    """Complete conversion of `convert_partially` in calling thread."""
+    if isinstance(res, DataFrameParts):
+        return assemble_dataframe(res.data, res.index)
+    return res
 
 
 class RLibraryWrapper:
     """Shallow wrapper of R package."""
 
-    def __init__(self, lib_name: str) -> None:
-        """Import R package."""
-        self.__lib = importr_cached(lib_name.replace("_", "."))
+    def __init__(self, lib_name: str, lazy: bool = False) -> None:
+        """Import R package.
+
+        If `lazy` is set, results of R functions are returned as `RObjectProxy`s
+        which are only converted to Python when accessed.
+        """
+        self.__lib_name = lib_name.replace("_", ".")
+        self.__lib = _executor.call_r(importr_cached, self.__lib_name)
+        self.__lazy = lazy
+        self.__functions = {}
+
+    @property
+    def _lib_name(self) -> str:
+        """Name of the wrapped R package."""
+        return self.__lib_name
 
     def __getattr__(self, name: str) -> Callable:
-        """Access method of R package."""
+        """Access method of R package.
 
-        def wrapper(*args, **kwargs):
-            logger.trace("Calling {name}", name=name)
+        Resolved functions are cached until the package is reloaded
+        using `importr_cached(..., reload=True)`.
+        """
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        # only dispatch to the R thread if the package is not imported (anymore)
+        lib = R_MODULE_DICT.get(self.__lib_name)
+        if lib is None:
+            lib = _executor.call_r(importr_cached, self.__lib_name)
+        if lib is not self.__lib:
+            # package was reloaded
+            self.__lib = lib
+            self.__functions.clear()
+
+        try:
+            return self.__functions[name]
+        except KeyError:
+            pass
+
+        func = getattr(lib, name)
+        prm_translate = getattr(func, "_prm_translate", {})
+        lazy = self.__lazy
+
+        lib_name = self.__lib_name
+
+        def convert(res, cv):
+            if lazy:
+                return RObjectProxy(res)
+            return cv.rpy2py(res)
+
+        def call(args, kwargs, convert):
             with localconverter(converter) as cv:
-                res = getattr(self.__lib, name)(*args, **kwargs)
-                return cv.rpy2py(res)
+                if ACTIVE_PROFILERS:
+                    return profiled_call(
+                        lib_name, name, func, args, kwargs, cv, prm_translate, convert
+                    )
 
+                res = call_rfunc(func, args, kwargs, cv, prm_translate)
+                return convert(res, cv), None
+
+        def wrapper(*args, **kwargs):
+            if _executor.THREAD_SAFE and not _executor.in_r_thread():
+                res, record = _executor.call_r(
+                    call, args, kwargs, convert if lazy else convert_partially
+                )
+
+                start = time.perf_counter()
+                res = finish_conversion(res)
+                assembly = time.perf_counter() - start
+
+                if record is not None:
+                    # assembly in the calling thread is part of the result conversion
+                    record = record._replace(
+                        result_conversion=record.result_conversion + assembly
+                    )
+            else:
+                res, record = call(args, kwargs, convert)
+
+            if record is not None:
+                add_record(record)
+            return res
+
+        self.__functions[name] = wrapper
         return wrapper
 
     def __repr__(self) -> str:
-        lib_path = ro.r(f"find.package('{self.__lib.__rname__}')")[0]
+        lib_path = _executor.call_r(ro.r, f"find.package('{self.__lib.__rname__}')")[0]
         return f"<module '{self.__lib.__rname__}' from '{lib_path}'>"
+
+
+def lazy(lib: RLibraryWrapper) -> RLibraryWrapper:
+    """Return variant of wrapped R package which returns lazy `RObjectProxy`s."""
+    return RLibraryWrapper(lib._lib_name, lazy=True)
@@ -1,3 +1,5 @@
+import sys
+import array
 import datetime
 
 import numpy as np
@@ -9,10 +11,17 @@ import pytest
 import numpy.testing as npt
 import pandas.testing as pdt
 
+import geopandas as gpd
+import geopandas.testing as gpdt
+
 import igraph
+import scipy.sparse
+import shapely
 from shapely import geometry
 
-from rwrap.converter import converter
+import rwrap.converter
+from rwrap import _tracing as tracing
+from rwrap.converter import converter, CLASS_CONVERTERS, register_class_converter
 
 
 @pytest.mark.parametrize(
@@ -56,6 +65,10 @@ from rwrap.converter import converter
             'list(foo = lubridate::ymd("2000-01-01"))',
             {"foo": datetime.datetime(2000, 1, 1)},
         ),
+        (
+            'as.POSIXct("2020-01-01 12:00:00", tz = "UTC")',
+            datetime.datetime(2020, 1, 1, 12, tzinfo=datetime.timezone.utc),
+        ),
         # geometry
         ("sf::st_point(c(1, 2))", geometry.Point(1, 2)),
         (
@@ -71,6 +84,11 @@ from rwrap.converter import converter
                 ]
             ),
         ),
+        ("sf::st_point(c(1, 2, 3))", geometry.Point(1, 2, 3)),
+        (
+            "sf::st_linestring(matrix(c(0, 0, 1, 1), ncol = 2, byrow = TRUE))",
+            geometry.LineString([(0, 0), (1, 1)]),
+        ),
         # networks
         (
             "igraph::graph_from_data_frame(data.frame(from = c('A', 'B'), to = c('B', 'C')), directed = FALSE)",
@@ -78,7 +96,7 @@ from rwrap.converter import converter
                 n=3,
                 edges=[(0, 1), (1, 2)],
                 directed=False,
-                vertex_attrs={"name": ["A", "B", "C"], "id": ["n0", "n1", "n2"]},
+                vertex_attrs={"name": ["A", "B", "C"]},
             ),
         ),
         (
@@ -91,7 +109,6 @@ from rwrap.converter import converter
                 vertex_attrs={
                     "name": ["a", "b", "c", "d"],
                     "color": ["red", "red", "red", "red"],
-                    "id": ["n0", "n1", "n2", "n3"],
                 },
                 edge_attrs={
                     "weight": [1, 2, 3, 4],
@@ -123,3 +140,487 @@ def test_equality(tmp_path, r_expr, py_data):
     # py2rpy
     # py_data_conv = converter.py2rpy(py_data)
     # assert r_data.r_repr() == py_data_conv.r_repr()
+
+
+@pytest.mark.parametrize(
+    "r_expr,py_data",
+    [
+        ("c(42)", 42),
+        ("c(1.5, 2, 3)", np.array([1.5, 2, 3])),
+        ("c(1L, 2L)", np.array([1, 2], dtype=np.int32)),
+        ("c(TRUE, FALSE)", np.array([True, False])),
+        ('c("a", "b")', np.array(["a", "b"], dtype=object)),
+        ("c(1L, NA)", pd.array([1, None], dtype="Int32")),
+        ("c(a = 1, b = 2)", pd.Series([1.0, 2.0], index=["a", "b"])),
+    ],
+)
+def test_vector_mode_numpy(monkeypatch, r_expr, py_data):
+    monkeypatch.setattr(rwrap.converter, "VECTOR_MODE", "numpy")
+
+    r_data_conv = converter.rpy2py(ro.r(r_expr))
+
+    if isinstance(py_data, pd.Series):
+        pdt.assert_series_equal(r_data_conv, py_data)
+    elif isinstance(py_data, pd.api.extensions.ExtensionArray):
+        pdt.assert_extension_array_equal(r_data_conv, py_data)
+    elif isinstance(py_data, np.ndarray):
+        npt.assert_array_equal(r_data_conv, py_data)
+        assert r_data_conv.dtype == py_data.dtype
+    else:
+        assert r_data_conv == py_data
+
+
+def test_vector_mode_numpy_readonly(monkeypatch):
+    monkeypatch.setattr(rwrap.converter, "VECTOR_MODE", "numpy")
+
+    r_data = ro.r("c(1.5, 2.5)")
+    r_data_conv = converter.rpy2py(r_data)
+
+    # views of R's memory must not modify the R object
+    with pytest.raises(ValueError):
+        r_data_conv[0] = 0
+    assert r_data[0] == 1.5
+
+
+def test_integer_dates(monkeypatch):
+    monkeypatch.setattr(rwrap.converter, "VECTOR_MODE", "numpy")
+
+    res = converter.rpy2py(ro.r(".Date(c(1L, NA))"))
+    assert res[0] == pd.Timestamp("1970-01-02")
+    assert pd.isna(res[1])
+
+
+def test_dataframe_dtypes():
+    r_data = ro.r(
+        "data.frame(d = c(1.5, NA), i = c(1L, NA), l = c(TRUE, NA), s = c('a', NA), f = factor(c('b', 'a')))"
+    )
+
+    r_data_conv = converter.rpy2py(r_data)
+
+    pdt.assert_frame_equal(
+        r_data_conv,
+        pd.DataFrame(
+            {
+                "d": np.array([1.5, np.nan]),
+                "i": pd.array([1, None], dtype="Int32"),
+                "l": pd.array([True, None], dtype="boolean"),
+                "s": np.array(["a", None], dtype=object),
+                "f": pd.Categorical(["b", "a"], categories=["a", "b"]),
+            },
+            index=["1", "2"],
+        ),
+    )
+
+
+def test_dataframe_arrow(monkeypatch):
+    from rwrap.arrow_bridge import is_available
+
+    if not is_available():
+        pytest.skip("pyarrow or R package arrow not installed")
+
+    r_data = ro.r(
+        "data.frame(d = c(1.5, NA), i = c(1L, NA), l = c(TRUE, NA), s = c('a', NA), f = factor(c('b', 'a')), row.names = c('x', 'y'))"
+    )
+
+    monkeypatch.setattr(rwrap.converter, "ARROW_MODE", "never")
+    expected = converter.rpy2py(r_data)
+
+    monkeypatch.setattr(rwrap.converter, "ARROW_MODE", "auto")
+    monkeypatch.setattr(rwrap.converter, "ARROW_MIN_ROWS", 0)
+    r_data_conv = converter.rpy2py(r_data)
+
+    pdt.assert_frame_equal(r_data_conv, expected)
+    assert ro.r["identical"](converter.py2rpy(r_data_conv), r_data)[0]
+
+
+def test_dataframe_arrow_duplicate_index(monkeypatch):
+    df = pd.DataFrame({"x": [1.5, 2.5, 3.5]}, index=["a", "a", "b"])
+
+    monkeypatch.setattr(rwrap.converter, "ARROW_MODE", "never")
+    expected = converter.py2rpy(df)
+
+    # same result as the column-wise conversion above the threshold
+    monkeypatch.setattr(rwrap.converter, "ARROW_MODE", "auto")
+    monkeypatch.setattr(rwrap.converter, "ARROW_MIN_ROWS", 2)
+    assert ro.r["identical"](converter.py2rpy(df), expected)[0]
+
+
+@pytest.mark.parametrize("large", [False, True])
+def test_matrix(monkeypatch, large):
+    if large:
+        monkeypatch.setattr(rwrap.converter, "LARGE_MATRIX_SIZE", 0)
+
+    res = converter.rpy2py(ro.r("matrix(c(1, 2, 3, 4, 5, 6), nrow = 2)"))
+    assert isinstance(res, np.ndarray)
+    npt.assert_array_equal(res, [[1, 3, 5], [2, 4, 6]])
+
+    # only large matrices are views of R's memory
+    assert res.flags.writeable != large
+
+    # return type does not depend on dimnames or size
+    res = converter.rpy2py(
+        ro.r("matrix(1:4, nrow = 2, dimnames = list(c('a', 'b'), c('x', 'y')))")
+    )
+    assert isinstance(res, np.ndarray)
+    npt.assert_array_equal(res, np.array([[1, 3], [2, 4]], dtype=np.int32))
+
+
+def test_large_matrix(monkeypatch, tmp_path):
+    monkeypatch.setattr(rwrap.converter, "LARGE_MATRIX_SIZE", 0)
+
+    mm = np.memmap(tmp_path / "matrix.dat", dtype=np.float64, mode="w+", shape=(2, 3))
+    mm[:] = [[1, 2, 3], [4, 5, 6]]
+    assert ro.r["identical"](
+        converter.py2rpy(mm),
+        ro.r("matrix(c(1, 2, 3, 4, 5, 6), nrow = 2, byrow = TRUE)"),
+    )[0]
+
+
+def test_dataframe_arrow_default_mode():
+    n = rwrap.converter.ARROW_MIN_ROWS
+    r_data = ro.r(f"data.frame(x = seq_len({n}), y = rep('a', {n}))")
+
+    df = converter.rpy2py(r_data)
+    assert df.shape == (n, 2)
+    assert df["x"].sum() == n * (n + 1) // 2
+
+    assert ro.r["nrow"](converter.py2rpy(df))[0] == n
+
+
+@pytest.mark.parametrize("rclass,fmt", [("C", "csc"), ("R", "csr"), ("T", "coo")])
+def test_sparse_matrix(rclass, fmt):
+    r_data = ro.r(
+        f"as(Matrix::sparseMatrix(i = c(1, 3), j = c(2, 3), x = c(1.5, 2), dims = c(3, 4)), 'dg{rclass}Matrix')"
+    )
+
+    mat = converter.rpy2py(r_data)
+    assert mat.format == fmt
+    npt.assert_array_equal(mat.toarray(), [[0, 1.5, 0, 0], [0, 0, 0, 0], [0, 0, 2, 0]])
+
+    assert ro.r["identical"](converter.py2rpy(mat), r_data)[0]
+
+
+@pytest.mark.parametrize("rclass,fmt", [("C", "csc"), ("R", "csr"), ("T", "coo")])
+def test_sparse_matrix_dimnames(rclass, fmt):
+    r_data = ro.r(
+        f"as(Matrix::sparseMatrix(i = c(1, 2), j = c(2, 1), x = c(1.5, 2), dimnames = list(c('a', 'b'), c('x', 'y'))), 'dg{rclass}Matrix')"
+    )
+
+    # dimnames are dropped, like for dense matrices
+    mat = converter.rpy2py(r_data)
+    assert mat.format == fmt
+    npt.assert_array_equal(mat.toarray(), [[0, 1.5], [2, 0]])
+
+    assert ro.r["identical"](
+        converter.py2rpy(mat), ro.r("function(x) { dimnames(x) <- NULL; x }")(r_data)
+    )[0]
+
+
+@pytest.mark.parametrize("rclass,fmt", [("C", "csc"), ("R", "csr"), ("T", "coo")])
+def test_sparse_matrix_subclass(rclass, fmt):
+    r_data = ro.r(
+        f"""
+        methods::setClass("sub{rclass}", contains = "dg{rclass}Matrix")
+        methods::new(
+            "sub{rclass}",
+            as(Matrix::sparseMatrix(i = c(1, 2), j = c(2, 1), x = c(1.5, 2)), "dg{rclass}Matrix")
+        )
+        """
+    )
+
+    mat = converter.rpy2py(r_data)
+    assert mat.format == fmt
+    npt.assert_array_equal(mat.toarray(), [[0, 1.5], [2, 0]])
+
+
+def test_sparse_dataframe():
+    df = pd.DataFrame.sparse.from_spmatrix(
+        scipy.sparse.csc_matrix(np.array([[0, 1.5], [2, 0]])),
+        index=["a", "b"],
+        columns=["x", "y"],
+    )
+
+    assert ro.r["identical"](
+        converter.py2rpy(df),
+        ro.r(
+            "Matrix::sparseMatrix(i = c(2, 1), j = c(1, 2), x = c(2, 1.5), dimnames = list(c('a', 'b'), c('x', 'y')))"
+        ),
+    )[0]
+
+
+@pytest.mark.parametrize(
+    "py_data,r_expr",
+    [
+        ([1, 2, 3], "c(1L, 2L, 3L)"),
+        ([2**40, 1], "c(2^40, 1)"),
+        ([1.5, 2.0], "c(1.5, 2)"),
+        ([True, False], "c(TRUE, FALSE)"),
+        (["a", "b"], 'c("a", "b")'),
+        ([1, "a"], 'list("1" = 1L, "2" = "a")'),
+        (np.array([1.5, 2]), "c(1.5, 2)"),
+        (np.array([1, 2]), "c(1L, 2L)"),
+        (array.array("i", [1, 2]), "c(1L, 2L)"),
+        (array.array("d", [1.5, 2]), "c(1.5, 2)"),
+        (array.array("u", "ab"), 'c("a", "b")'),
+        (pd.Series([1.5, 2.0], index=["a", "b"]), "c(a = 1.5, b = 2)"),
+        (datetime.datetime(2017, 1, 31), 'as.Date("2017-01-31")'),
+        (
+            [datetime.date(2017, 1, 31), datetime.date(2020, 2, 1)],
+            'as.Date(c("2017-01-31", "2020-02-01"))',
+        ),
+        (
+            np.array(["2017-01-31", "NaT"], dtype="datetime64[D]"),
+            'as.Date(c("2017-01-31", NA))',
+        ),
+        (
+            pd.DatetimeIndex(["2020-01-01 12:00:00"]).tz_localize("Europe/Berlin"),
+            'as.POSIXct("2020-01-01 12:00:00", tz = "Europe/Berlin")',
+        ),
+        (
+            pd.Categorical(["b", "a", None], categories=["a", "b"]),
+            'factor(c("b", "a", NA), levels = c("a", "b"))',
+        ),
+        (
+            pd.Categorical(["low", "high"], categories=["low", "high"], ordered=True),
+            'factor(c("low", "high"), levels = c("low", "high"), ordered = TRUE)',
+        ),
+        (
+            pd.Series(pd.Categorical(["b", "a"]), index=["x", "y"]),
+            'structure(factor(c("b", "a")), names = c("x", "y"))',
+        ),
+    ],
+)
+def test_py2rpy(py_data, r_expr):
+    py_data_conv = converter.py2rpy(py_data)
+    assert ro.r["identical"](py_data_conv, ro.r(r_expr))[0]
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_factor(ordered):
+    r_data = ro.r(
+        f"factor(c('b', NA, 'a', 'b'), levels = c('b', 'a'), ordered = {str(ordered).upper()})"
+    )
+
+    cat = converter.rpy2py(r_data)
+    pdt.assert_extension_array_equal(
+        cat,
+        pd.Categorical(["b", None, "a", "b"], categories=["b", "a"], ordered=ordered),
+    )
+
+    assert ro.r["identical"](converter.py2rpy(cat), r_data)[0]
+
+
+def test_named_factor():
+    r_data = ro.r("factor(c(x = 'b', y = 'a'))")
+
+    res = converter.rpy2py(r_data)
+    pdt.assert_series_equal(
+        res, pd.Series(pd.Categorical(["b", "a"]), index=["x", "y"])
+    )
+
+    assert ro.r["identical"](converter.py2rpy(res), r_data)[0]
+
+
+def test_nested_list():
+    r_data = ro.r("list(a = list(b = 1:3, c = list(d = 'x')), e = list(1, 'y'))")
+    assert converter.rpy2py(r_data) == {
+        "a": {"b": [1, 2, 3], "c": {"d": "x"}},
+        "e": [1, "y"],
+    }
+
+    py_data = {"a": {"b": [1, 2, 3], "c": {"d": "x"}}, "e": [1, "y"]}
+    assert ro.r["identical"](
+        converter.py2rpy(py_data),
+        ro.r(
+            "list(a = list(b = 1:3, c = list(d = 'x')), e = list('1' = 1L, '2' = 'y'))"
+        ),
+    )[0]
+
+
+def test_deeply_nested_list():
+    depth = 5 * sys.getrecursionlimit()
+
+    py_data = {"leaf": [1.5, 2.5]}
+    for _ in range(depth):
+        py_data = {"child": py_data}
+
+    res = converter.rpy2py(converter.py2rpy(py_data))
+    for _ in range(depth):
+        res = res["child"]
+    assert res == {"leaf": [1.5, 2.5]}
+
+
+def test_igraph_roundtrip(tmp_path):
+    graph = igraph.Graph(
+        n=4,
+        edges=[(0, 1), (1, 2)],
+        directed=True,
+        graph_attrs={"name": "foo"},
+        vertex_attrs={"name": ["a", "b", "c", "d"]},
+        edge_attrs={"weight": [1.5, 2.5]},
+    )
+
+    graph_conv = converter.rpy2py(converter.py2rpy(graph))
+
+    fname_orig = tmp_path / "orig.gml"
+    graph.write_graphml(str(fname_orig))
+
+    fname_conv = tmp_path / "conv.gml"
+    graph_conv.write_graphml(str(fname_conv))
+
+    assert fname_orig.read_text() == fname_conv.read_text()
+
+
+@pytest.mark.parametrize("n", [1, 2])
+def test_igraph_list_attribute(n):
+    r_data = ro.r(
+        f"""
+        g <- igraph::make_empty_graph({n})
+        igraph::vertex_attr(g, "data") <- rep(list(c(1.5, 2.5)), {n})
+        igraph::vertex_attr(g, "label") <- rep("a", {n})
+        g
+        """
+    )
+
+    graph = converter.rpy2py(r_data)
+    assert graph.vs["data"] == [[1.5, 2.5]] * n
+    assert graph.vs["label"] == ["a"] * n
+
+
+def test_sfc_crs():
+    r_data = ro.r(
+        "sf::st_sfc(sf::st_point(c(1, 2)), sf::st_point(c(3, 4)), crs = 4326)"
+    )
+
+    r_data_conv = converter.rpy2py(r_data)
+
+    assert r_data_conv.crs.to_epsg() == 4326
+    assert list(r_data_conv) == [geometry.Point(1, 2), geometry.Point(3, 4)]
+
+
+@pytest.mark.skipif(
+    not hasattr(shapely, "has_m") or shapely.geos_version < (3, 12, 0),
+    reason="M coordinates require shapely>=2.1 with GEOS>=3.12",
+)
+@pytest.mark.parametrize(
+    "r_expr,wkt",
+    [
+        ("sf::st_point(c(1, 2, 3), dim = 'XYM')", "POINT M (1 2 3)"),
+        (
+            "sf::st_linestring(rbind(c(0, 0, 1, 2), c(1, 1, 3, 4)), dim = 'XYZM')",
+            "LINESTRING ZM (0 0 1 2, 1 1 3 4)",
+        ),
+    ],
+)
+def test_geometry_m(r_expr, wkt):
+    # single geometry and in bulk
+    res = converter.rpy2py(ro.r(r_expr))
+    assert shapely.has_m(res)
+    assert res.wkt == wkt
+
+    res = converter.rpy2py(ro.r(f"sf::st_sfc({r_expr})"))
+    assert list(res.to_wkt()) == [wkt]
+
+
+def test_geodataframe_roundtrip():
+    gdf = gpd.GeoDataFrame(
+        {"x": [1.5, 2.5]},
+        geometry=[
+            geometry.Point(1, 2),
+            geometry.Polygon([(0, 0), (10, 0), (10, 10), (0, 0)]),
+        ],
+        crs="EPSG:4326",
+    )
+
+    gdf_conv = converter.rpy2py(converter.py2rpy(gdf))
+
+    gpdt.assert_geodataframe_equal(gdf_conv, gdf, check_crs=False)
+    assert gdf_conv.crs.to_epsg() == 4326
+
+
+def test_class_converter_registry():
+    r_data = ro.r("structure(list(x = 1), class = c('myclass', 'data.frame'))")
+
+    @register_class_converter("myclass")
+    def convert_myclass(obj):
+        return {"custom": True}
+
+    try:
+        assert converter.rpy2py(r_data) == {"custom": True}
+
+        # higher priority wins over more specific class
+        register_class_converter(
+            "data.frame", lambda obj: {"custom": False}, priority=1
+        )
+        assert converter.rpy2py(r_data) == {"custom": False}
+    finally:
+        CLASS_CONVERTERS.unregister("myclass")
+        register_class_converter("data.frame", rwrap.converter.convert_dataframe)
+
+
+def test_class_converter_registry_s4():
+    ro.r("setClass('Base', representation(x = 'numeric'))")
+    ro.r("setClass('Derived', contains = 'Base')")
+    r_data = ro.r("new('Derived', x = 42)")
+
+    register_class_converter("Base", lambda obj: obj.do_slot("x")[0])
+    try:
+        assert converter.rpy2py(r_data) == 42
+    finally:
+        CLASS_CONVERTERS.unregister("Base")
+
+
+def test_tracing():
+    events = []
+    tracing.add_listener(events.append)
+    tracing.enable_tracing()
+
+    try:
+        converter.rpy2py(ro.r("c(1, 2, 3)"))
+    finally:
+        tracing.disable_tracing()
+        tracing.remove_listener(events.append)
+
+    event = events[-1]
+    assert event.direction == "rpy2py"
+    assert event.rclass == ("numeric",)
+    assert event.length == 3
+    assert event.nbytes == 24
+
+    # no events are emitted once tracing is disabled
+    n_events = len(events)
+    converter.rpy2py(ro.r("c(1, 2, 3)"))
+    assert len(events) == n_events
+
+
+class OptionalType:
+    pass
+
+
+def test_tracing_optional_converters(monkeypatch):
+    def register():
+        converter.py2rpy.register(OptionalType, lambda obj: ro.IntVector([1, 2]))
+
+    monkeypatch.setitem(
+        rwrap.converter.OPTIONAL_PY2RPY, __name__.partition(".")[0], register
+    )
+
+    was_enabled = tracing.is_tracing_enabled()
+    events = []
+    tracing.add_listener(events.append)
+    tracing.enable_tracing()
+
+    try:
+        # converter is registered after tracing was enabled
+        converter.py2rpy(OptionalType())
+    finally:
+        tracing.disable_tracing()
+        tracing.remove_listener(events.append)
+
+        # types cannot be unregistered, restore the generic handler instead
+        converter.py2rpy.register(OptionalType, converter.py2rpy.dispatch(object))
+        if was_enabled:
+            tracing.enable_tracing()
+
+    # both the generic `object` handler and the newly registered one are traced
+    assert [e.pytype for e in events].count("OptionalType") == 2
@@ -0,0 +1,19 @@
+import sys
+import subprocess
+
+
+def test_optional_dependencies_not_imported():
+    code = "import sys, rwrap; print(sorted({'geopandas', 'shapely', 'igraph'} & set(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert proc.stdout.strip() == "[]"
+
+
+def test_helper_modules_not_imported():
+    modules = {"rwrap._pool", "rwrap._cache", "rwrap._pipeline", "rwrap._tracing"}
+    code = f"import sys, rwrap; print(sorted({modules!r} & set(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert proc.stdout.strip() == "[]"
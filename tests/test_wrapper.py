@@ -0,0 +1,284 @@
+import pickle
+import asyncio
+import concurrent.futures
+
+import numpy as np
+import pandas as pd
+
+import pytest
+
+import rwrap
+from rwrap import RObjectProxy
+from rwrap.converter import importr_cached
+
+
+def test_lazy():
+    base = rwrap.lazy(rwrap.base)
+
+    res = base.seq(1, 5)
+    assert isinstance(res, RObjectProxy)
+
+    # passing proxy back to R does not require conversion
+    assert base.sum(res).materialize() == 15
+
+    assert len(res) == 5
+    assert res[0] == 1
+    np.testing.assert_array_equal(np.asarray(res), [1, 2, 3, 4, 5])
+
+
+def test_package_names():
+    # internal modules do not shadow R packages of the same name
+    assert isinstance(rwrap.proxy, rwrap.RLibraryWrapper)
+    assert isinstance(rwrap.pool, rwrap.RLibraryWrapper)
+
+
+def test_function_cache():
+    assert rwrap.stats is rwrap.stats
+
+    p_adjust = rwrap.stats.p_adjust
+    assert rwrap.stats.p_adjust is p_adjust
+    assert p_adjust([0.01, 0.02], method="bonferroni") == [0.02, 0.04]
+
+    # reloading the package invalidates resolved functions
+    importr_cached("stats", reload=True)
+    assert rwrap.stats.p_adjust is not p_adjust
+
+
+def test_profiler(tmp_path):
+    with rwrap.Profiler() as prof:
+        rwrap.stats.p_adjust([0.01, 0.02])
+        rwrap.stats.p_adjust([0.01, 0.02])
+
+    # R function names are recorded
+    df = prof.to_dataframe()
+    assert list(df["function"]) == ["p.adjust", "p.adjust"]
+    assert (df["argument_size"] > 0).all()
+
+    assert prof.summary().loc[("stats", "p.adjust"), "calls"] == 2
+
+    trace = prof.to_chrome_trace(tmp_path / "trace.json")
+    assert len(trace["traceEvents"]) == 2 * 4
+    assert (tmp_path / "trace.json").exists()
+
+
+def test_profiler_thread_safe(monkeypatch):
+    monkeypatch.setattr(rwrap._executor, "THREAD_SAFE", True)
+
+    with rwrap.Profiler() as prof:
+        df = rwrap.base.data_frame(x=[1.5, 2.5])
+
+    assert df["x"].sum() == 4
+    assert list(prof.to_dataframe()["function"]) == ["data.frame"]
+    assert prof.records[0].result_conversion > 0
+
+
+def test_pool():
+    df = pd.DataFrame({"x": [1.0, 2.0], "y": ["a", "b"]}, index=["r1", "r2"])
+
+    with rwrap.RPool(["stats", "base"], max_workers=2) as pool:
+        assert pool.stats.median([1, 2, 3]).result() == 2
+        assert list(pool.map("base", "sum", [[1, 2], [3, 4]])) == [3, 7]
+
+        res = pool.base.identity(df).result()
+        pd.testing.assert_frame_equal(res, df)
+
+
+def test_aio(monkeypatch):
+    monkeypatch.setattr(rwrap._executor, "THREAD_SAFE", False)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        res = await asyncio.gather(
+            rwrap.aio.base.Sys_sleep(0.2), rwrap.aio.stats.median([1, 2, 3])
+        )
+        task.cancel()
+
+        return res, ticks
+
+    (_, median), ticks = asyncio.run(main())
+    assert median == 2
+
+    # event loop was not blocked while R was running
+    assert ticks > 1
+
+    # thread-safe mode is only enabled explicitly
+    assert not rwrap._executor.THREAD_SAFE
+
+
+def test_cached(tmp_path):
+    stats = rwrap.cached(rwrap.stats, tmp_path)
+
+    assert stats.p_adjust([0.01, 0.02], method="bonferroni") == [0.02, 0.04]
+    assert len(list(tmp_path.glob("*.rds"))) == 1
+
+    # cached result is returned
+    assert stats.p_adjust([0.01, 0.02], method="bonferroni") == [0.02, 0.04]
+    assert len(list(tmp_path.glob("*.rds"))) == 1
+
+    # arguments are part of key
+    assert stats.p_adjust([0.01, 0.02], method="none") == [0.01, 0.02]
+    assert len(list(tmp_path.glob("*.rds"))) == 2
+
+    # NULL results are cached as well
+    base = rwrap.cached(rwrap.base, tmp_path / "null")
+    assert base.invisible(None) is None
+    fname = next((tmp_path / "null").glob("*.rds"))
+    mtime = fname.stat().st_mtime_ns
+    assert base.invisible(None) is None
+    assert fname.stat().st_mtime_ns == mtime
+
+    # dataframes
+    base = rwrap.cached(rwrap.base, tmp_path / "df")
+    df = base.data_frame(x=[1.5, 2.5])
+    pd.testing.assert_frame_equal(base.data_frame(x=[1.5, 2.5]), df)
+
+    # arguments whose state is not part of their serialization bypass the cache
+    base = rwrap.cached(rwrap.base, tmp_path / "env")
+    env = rwrap.lazy(rwrap.base).new_env()
+    base.assign("x", 1, envir=env)
+    assert base.get("x", envir=env) == 1
+    base.assign("x", 2, envir=env)
+    assert base.get("x", envir=env) == 2
+    assert list((tmp_path / "env").iterdir()) == []
+
+    # eviction
+    stats = rwrap.cached(rwrap.stats, tmp_path / "small", max_size=1)
+    stats.p_adjust([0.01, 0.02])
+    assert list((tmp_path / "small").iterdir()) == []
+
+
+def test_iter_chunks():
+    base = rwrap.lazy(rwrap.base)
+
+    df = base.data_frame(x=list(range(10)), y=[str(i) for i in range(10)])
+    chunks = list(df.iter_chunks(chunksize=4))
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    pd.testing.assert_frame_equal(pd.concat(chunks), df.materialize())
+
+    mat = base.matrix(list(range(10)), nrow=5)
+    chunks = list(rwrap.iter_chunks(mat.robj, chunksize=2))
+    np.testing.assert_array_equal(np.vstack(chunks), np.asarray(mat))
+
+    # released proxies cannot be converted anymore
+    df = base.data_frame(x=list(range(10)))
+    assert len(list(df.iter_chunks(chunksize=4, release=True))) == 3
+    with pytest.raises(ValueError):
+        df.materialize()
+
+
+def test_iter_chunks_threshold(monkeypatch):
+    # first chunk is above, second chunk below the thresholds
+    monkeypatch.setattr(rwrap.converter, "ARROW_MIN_ROWS", 8)
+    monkeypatch.setattr(rwrap.converter, "LARGE_MATRIX_SIZE", 12)
+    base = rwrap.lazy(rwrap.base)
+
+    dates = base.as_Date(list(range(10)), origin="1970-01-01")
+    df = base.data_frame(date=dates, x=[float(i) for i in range(10)])
+    chunks = list(df.iter_chunks(chunksize=6))
+    assert [len(c) for c in chunks] == [6, 4]
+    assert chunks[0].dtypes.equals(chunks[1].dtypes)
+    assert chunks[0]["date"].dtype == "datetime64[ns]"
+
+    mat = base.matrix(
+        [float(i) for i in range(20)],
+        nrow=10,
+        dimnames=[[str(i) for i in range(10)], ["a", "b"]],
+    )
+    chunks = list(mat.iter_chunks(chunksize=6))
+    assert all(isinstance(c, np.ndarray) for c in chunks)
+    assert chunks[0].dtype == chunks[1].dtype
+    assert all(c.flags.writeable for c in chunks)
+    np.testing.assert_array_equal(np.vstack(chunks), np.asarray(mat))
+
+
+def test_pipeline():
+    p = rwrap.Pipeline()
+
+    x = p.base.seq(1, 10)
+    total = p.base.sum(x)
+    adjusted = p.stats.p_adjust([0.01, 0.02], method="bonferroni")
+
+    assert p.run(total, adjusted) == (55, [0.02, 0.04])
+    assert p.run() == [0.02, 0.04]
+
+    with pytest.raises(ValueError):
+        rwrap.Pipeline().base.sum(x)
+
+    # references are only valid as top-level arguments and outputs of their pipeline
+    p.base.c([x, 1])
+    with pytest.raises(TypeError):
+        p.run()
+
+    other = rwrap.Pipeline()
+    other.base.sum(1)
+    with pytest.raises(ValueError):
+        other.run(x)
+
+    # identifiers of garbage collected pipelines are not reused
+    stale = rwrap.Pipeline().base.sum(1)
+    for _ in range(10):
+        other = rwrap.Pipeline()
+        other.base.sum(1)
+        with pytest.raises(ValueError):
+            other.run(stale)
+
+
+def test_thread_safe(monkeypatch):
+    monkeypatch.setattr(rwrap._executor, "THREAD_SAFE", True)
+
+    def work(i):
+        df = rwrap.base.data_frame(x=[float(i), 1.0])
+        return rwrap.stats.median(list(range(i + 1))), df["x"].sum()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(work, range(32)))
+
+    assert results == [(i / 2, i + 1.0) for i in range(32)]
+
+
+def test_thread_safe_helpers(monkeypatch, tmp_path):
+    monkeypatch.setattr(rwrap._executor, "THREAD_SAFE", True)
+    base = rwrap.lazy(rwrap.base)
+    stats = rwrap.cached(rwrap.stats, tmp_path)
+
+    def work(i):
+        # columns which are only assembled in the calling thread
+        df = base.data_frame(
+            x=pd.Categorical(["a", "b"]),
+            d=base.as_Date([i, 1], origin="1970-01-01"),
+            n=[i, 1],
+        )
+        assert repr(df).startswith("<RObjectProxy")
+        chunks = list(df.iter_chunks(chunksize=1))
+
+        p = rwrap.Pipeline()
+        total = p.base.sum(p.base.seq(1, i + 1))
+
+        return pd.concat(chunks), p.run(total), stats.median(list(range(i + 1)))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(work, range(16)))
+
+    for i, (df, total, median) in enumerate(results):
+        assert list(df["x"]) == ["a", "b"]
+        assert df["d"].iloc[0] == pd.Timestamp(i, unit="D")
+        assert df["n"].dtype == "Int32"
+        assert total == (i + 1) * (i + 2) // 2
+        assert median == i / 2
+
+
+def test_pool_arrow_fallback():
+    pytest.importorskip("pyarrow")
+    from rwrap._pool import ArrowFrame
+
+    # not representable by Arrow, falls back to regular pickling
+    df = pd.DataFrame({"x": [1, "a"]})
+    pd.testing.assert_frame_equal(pickle.loads(pickle.dumps(ArrowFrame(df))), df)